@@ -0,0 +1,250 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Benchmark suite for the Game of Life step implementations
+# ---------------------------------------------------------------------------
+# Times the update functions of every front-end on the same seeded boards:
+#   v1, v2, v3  update() (draws every generation, so only timed with rendering)
+#   v4          update_game_state() plus draw_cells()
+#   v5          gameOfLife_engine.update_game_state() plus its BoardRenderer (a
+#               window-sized viewport, so larger boards only draw what is in view)
+#   curses      update_game_state() (terminal drawing is not timed)
+# across board sizes, wrap and no-wrap, and starting densities, with and
+# without rendering to an offscreen pygame surface. Every version steps the
+# board dtype its own init builds (float64 up to v4, uint8 after), v1 only
+# runs unwrapped boards and v2 only wrapped ones, as in the original versions.
+#
+# Each case reports generations per second, per-generation latency
+# percentiles and the peak memory of one generation (traced separately with
+# tracemalloc so tracing does not skew the timings). Results are written as
+# JSON; pass a previous results file as --baseline to flag cases that got
+# slower or use more memory than the tolerance allows.
+#
+# Example:
+#   python gameOfLife_bench.py --out bench.json
+#   python gameOfLife_bench.py --impl v5 curses --sizes 500 2000 --baseline bench.json
+# ---------------------------------------------------------------------------
+
+import argparse
+import builtins
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')    # Offscreen rendering, no window
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from gameOfLife_engine import random_pattern, update_game_state
+from gameOfLife_rules import CONWAY
+
+# Timed implementations: module, board dtype, wrap modes it runs, render modes it runs, largest board size
+IMPLEMENTATIONS = {
+    'v1': ('gameOfLife_v1', np.float64, (False,), (True,), 500),
+    'v2': ('gameOfLife_v2', np.float64, (True,), (True,), None),
+    'v3': ('gameOfLife_v3', np.float64, (True, False), (True,), None),
+    'v4': ('gameOfLife_v4', np.float64, (True, False), (True, False), None),
+    'v5': ('gameOfLife_v5', np.uint8, (True, False), (True, False), None),
+    'curses': ('gameOfLife_curses', np.uint8, (True, False), (False,), None),
+}
+SIZES = (100, 250, 500, 1000)
+PROBABILITIES = (0.1, 0.25, 0.5)
+GENERATIONS = 50            # Timed generations per case, unless MAX_SECONDS runs out first
+MIN_GENERATIONS = 3         # Timed generations per case, however slow
+MAX_SECONDS = 2.0           # Time budget per case
+WARMUP_GENERATIONS = 1      # Untimed generations before timing
+CELL_SIZE = 2               # Pixels per cell of the offscreen surface
+TOLERANCE = 0.10            # Relative slowdown or memory growth flagged as a regression
+RESULTS_PATH = 'benchmark_results.json'
+
+
+def load_implementation(name):
+    """Import a front-end module; v1 to v3 prompt on import, every prompt is answered 'skip'."""
+    module_name = IMPLEMENTATIONS[name][0]
+    original_input = builtins.input
+    builtins.input = lambda prompt='': 'skip'   # Matches no menu option, so nothing starts
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter('ignore')     # Missing system fonts
+            return importlib.import_module(module_name)
+    finally:
+        builtins.input = original_input
+
+def make_stepper(name, module, cells, wrap, render, cellsize=CELL_SIZE):
+    """Return a step(gen) function advancing its own copy of cells one generation."""
+    import pygame
+    surface = pygame.Surface((cells.shape[1] * cellsize, cells.shape[0] * cellsize)) if render else None
+    state = {'cells': cells.astype(IMPLEMENTATIONS[name][1]), 'changed': []}
+
+    if name in ('v1', 'v2'):
+        def step(gen):
+            state['cells'] = module.update(surface, state['cells'], cellsize, gen)
+    elif name == 'v3':
+        def step(gen):
+            state['cells'] = module.update(surface, state['cells'], cellsize, gen, state['changed'], wrap)
+    elif name == 'v4':
+        def step(gen):
+            state['cells'], changed = module.update_game_state(state['cells'], cellsize, wrap)
+            if render:
+                module.draw_cells(surface, state['cells'], cellsize, changed)
+                module.render_generation_info(surface, gen)
+    elif name == 'v5':
+        renderer = module.make_renderer(cells.shape[1], cells.shape[0], cellsize) if render else None
+        if render:
+            surface = pygame.Surface(renderer.rect.size)    # The game window, not the whole board
+        def step(gen):
+            state['cells'], _ = update_game_state(state['cells'], wrap)
+            if render:
+                renderer.draw(surface, state['cells'])
+                module.render_game_info(surface, gen, 10, CONWAY)
+    else:
+        def step(gen):
+            state['cells'] = module.update_game_state(state['cells'], wrap)
+    return step
+
+def time_case(step, generations=GENERATIONS, max_seconds=MAX_SECONDS):
+    """Time step() per generation, returning the latencies in seconds."""
+    for gen in range(WARMUP_GENERATIONS):
+        step(gen)
+    latencies = []
+    start = time.perf_counter()
+    for gen in range(WARMUP_GENERATIONS, WARMUP_GENERATIONS + generations):
+        t0 = time.perf_counter()
+        step(gen)
+        latencies.append(time.perf_counter() - t0)
+        if len(latencies) >= MIN_GENERATIONS and time.perf_counter() - start > max_seconds:
+            break
+    return np.array(latencies)
+
+def peak_memory(name, module, cells, wrap, render, cellsize=CELL_SIZE):
+    """Peak traced bytes of setting up a stepper and running one generation."""
+    tracemalloc.start()
+    try:
+        make_stepper(name, module, cells, wrap, render, cellsize)(0)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def case_key(result):
+    """Key identifying a case across result files."""
+    return result['impl'], result['size'], result['wrap'], result['c_prob'], result['render']
+
+def run_suite(impls, sizes=SIZES, probabilities=PROBABILITIES, wraps=(True, False), renders=(True, False),
+              generations=GENERATIONS, max_seconds=MAX_SECONDS, cellsize=CELL_SIZE, seed=0):
+    """Run every supported case and return the list of results."""
+    results = []
+    print(f"{'impl':>6} {'size':>5} {'wrap':>5} {'c_prob':>6} {'render':>6} "
+          f"{'gen/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'peak MiB':>9}")
+    for name in impls:
+        _, _, impl_wraps, impl_renders, max_size = IMPLEMENTATIONS[name]
+        module = load_implementation(name)
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            for c_prob in probabilities:
+                cells = random_pattern(size, size, c_prob, seed)
+                for wrap in wraps:
+                    for render in renders:
+                        if wrap not in impl_wraps or render not in impl_renders:
+                            continue
+                        latencies = time_case(make_stepper(name, module, cells, wrap, render, cellsize),
+                                              generations, max_seconds)
+                        p50, p90, p99 = np.percentile(latencies, (50, 90, 99)) * 1000
+                        result = {
+                            'impl': name, 'size': size, 'wrap': wrap, 'c_prob': c_prob, 'render': render,
+                            'generations': len(latencies),
+                            'seconds': float(latencies.sum()),
+                            'gens_per_sec': float(len(latencies) / latencies.sum()),
+                            'latency_ms': {'p50': float(p50), 'p90': float(p90), 'p99': float(p99),
+                                           'max': float(latencies.max() * 1000)},
+                            'peak_bytes': int(peak_memory(name, module, cells, wrap, render, cellsize)),
+                        }
+                        results.append(result)
+                        print(f"{name:>6} {size:>5} {str(wrap):>5} {c_prob:>6} {str(render):>6} "
+                              f"{result['gens_per_sec']:>9.1f} {p50:>9.2f} {p99:>9.2f} "
+                              f"{result['peak_bytes'] / 2**20:>9.1f}")
+    return results
+
+def compare_results(results, baseline, tolerance=TOLERANCE):
+    """Compare results with a baseline results list, returning the regressions as messages."""
+    previous = {case_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        name = "{} size={} wrap={} c_prob={} render={}".format(*case_key(result))
+        if result['gens_per_sec'] < old['gens_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['gens_per_sec']:.1f} gen/s, "
+                               f"baseline {old['gens_per_sec']:.1f} gen/s")
+        if result['peak_bytes'] > old['peak_bytes'] * (1 + tolerance):
+            regressions.append(f"{name}: peak {result['peak_bytes'] / 2**20:.1f} MiB, "
+                               f"baseline {old['peak_bytes'] / 2**20:.1f} MiB")
+    return regressions
+
+def environment():
+    """Describe the machine and library versions the results were measured with."""
+    import pygame
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+def main(argv=None):
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description='Benchmark the Game of Life step implementations.')
+    parser.add_argument('--impl', nargs='+', choices=list(IMPLEMENTATIONS), default=list(IMPLEMENTATIONS),
+                        help='implementations to time')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='world sizes (square)')
+    parser.add_argument('--probs', type=float, nargs='+', default=list(PROBABILITIES),
+                        help='probabilities of cells being alive initially')
+    parser.add_argument('--wrap', choices=('both', 'wrap', 'no-wrap'), default='both', help='wrap modes to time')
+    parser.add_argument('--render', choices=('both', 'on', 'off'), default='both',
+                        help='time with rendering to an offscreen surface, without, or both')
+    parser.add_argument('--generations', type=int, default=GENERATIONS, help='timed generations per case')
+    parser.add_argument('--max-seconds', type=float, default=MAX_SECONDS,
+                        help=f'time budget per case (at least {MIN_GENERATIONS} generations are timed)')
+    parser.add_argument('--cell-size', type=int, default=CELL_SIZE, help='pixels per cell when rendering')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random boards')
+    parser.add_argument('--out', default=RESULTS_PATH, help='JSON results file')
+    parser.add_argument('--baseline', help='previous JSON results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='relative slowdown or memory growth flagged as a regression')
+    args = parser.parse_args(argv)
+
+    wraps = {'both': (True, False), 'wrap': (True,), 'no-wrap': (False,)}[args.wrap]
+    renders = {'both': (True, False), 'on': (True,), 'off': (False,)}[args.render]
+    settings = {key: value for key, value in vars(args).items() if key not in ('out', 'baseline')}
+    results = run_suite(args.impl, args.sizes, args.probs, wraps, renders, args.generations,
+                        args.max_seconds, args.cell_size, args.seed)
+
+    report = {'environment': environment(), 'settings': settings, 'results': results}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(results, json.load(f)['results'], args.tolerance)
+        report['regressions'] = regressions
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.baseline:
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
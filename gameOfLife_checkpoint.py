@@ -0,0 +1,75 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Memory-mapped checkpoints for the Game of Life
+# ---------------------------------------------------------------------------
+# A checkpoint is two files sharing a base path:
+#   <base>.npy   the uint8 board, a standard NumPy .npy file
+#   <base>.json  metadata: generation, wrap, rule, seed (plus front-end extras)
+#
+# Loading memory-maps the board copy-on-write, so resuming a huge board
+# starts immediately: pages are only read from disk when the first
+# generation touches them, and stepping never writes back to the file.
+# Saving writes to temporary files and renames them into place, so a
+# checkpoint that is currently memory-mapped is never modified underneath
+# the run that is using it.
+# ---------------------------------------------------------------------------
+
+import json
+import os
+
+import numpy as np
+
+CHECKPOINT_DIR = 'checkpoints'
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_paths(base):
+    """Return the (board, metadata) file paths of a checkpoint base path."""
+    base = base[:-len('.npy')] if base.endswith('.npy') else base
+    return base + '.npy', base + '.json'
+
+def checkpoint_exists(base):
+    """Check whether both files of a checkpoint exist."""
+    return all(os.path.exists(path) for path in checkpoint_paths(base))
+
+def save_checkpoint(base, cells, generation, wrap, rule, seed=None, **extra):
+    """Write the board and its metadata, returning the board file path."""
+    board_path, meta_path = checkpoint_paths(base)
+    os.makedirs(os.path.dirname(board_path) or '.', exist_ok=True)
+
+    # Written straight into a memory-mapped .npy, then renamed into place
+    tmp_board = board_path + '.tmp'
+    board = np.lib.format.open_memmap(tmp_board, mode='w+', dtype=np.uint8, shape=cells.shape)
+    board[...] = cells
+    board.flush()
+    del board
+
+    meta = {
+        'version': CHECKPOINT_VERSION,
+        'generation': int(generation),
+        'wrap': bool(wrap),
+        'rule': rule,
+        'seed': None if seed is None else int(seed),
+        'shape': list(cells.shape),
+    }
+    meta.update(extra)
+    tmp_meta = meta_path + '.tmp'
+    with open(tmp_meta, 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    os.replace(tmp_board, board_path)
+    os.replace(tmp_meta, meta_path)
+    return board_path
+
+def load_checkpoint(base):
+    """Memory-map a checkpoint copy-on-write, returning (cells, metadata)."""
+    board_path, meta_path = checkpoint_paths(base)
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {meta.get('version')} in {meta_path}")
+
+    cells = np.load(board_path, mmap_mode='c')
+    if list(cells.shape) != meta['shape'] or cells.dtype != np.uint8:
+        raise ValueError(f"Checkpoint board {board_path} does not match its metadata")
+    return cells, meta
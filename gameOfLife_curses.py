@@ -1,25 +1,49 @@
 import curses
+import locale
 import numpy as np
+import os
 import time
 
+from gameOfLife_checkpoint import CHECKPOINT_DIR, checkpoint_exists, load_checkpoint, save_checkpoint
+from gameOfLife_cycles import CycleDetector, describe_cycle
+from gameOfLife_engine import random_pattern, check_memory_budget, new_seed
+from gameOfLife_history import HistoryBuffer
+from gameOfLife_recorder import REPLAY_SPEEDS, Replay, latest_recording
+from gameOfLife_rules import CONWAY
+from gameOfLife_terminal import TerminalRenderer, supports_unicode
+
 # Globals and constants
 GAME_VARS = {
     'start': None,         # Start flag
+    'replay': None,        # Recording picked in the start menu
     'wrap': None,          # Wrap cells flag
     's_size': None,        # World size
     'c_prob': None         # Probability of cell being alive initially
 }
 
-CELL_HISTORY = []  # cell history
+HISTORY_BYTES = 64 * 2 ** 20  # Memory cap of the rewind history, 64 MiB
+REWIND_STEPS = 100  # Generations the rewind key goes back
+STOP_ON_CYCLE = True  # Stop stepping and redrawing once a cycle is confirmed
+CHECKPOINT_PATH = os.path.join(CHECKPOINT_DIR, 'gameOfLife_curses')  # Saved by 'c' and on quit
+RECORD_DIR = 'recordings'  # Replays offered by the start menu, written by the pygame and headless runs
+REPLAY_FPS = 30  # Frames per second of the replay viewer, REPLAY_SPEEDS sets the records per frame
+SCROLL_STEP = 8  # Characters scrolled per arrow or hjkl key press
+SCROLL_KEYS = {  # (rows, columns) each key scrolls by
+    curses.KEY_UP: (-1, 0), ord('k'): (-1, 0),
+    curses.KEY_DOWN: (1, 0), ord('j'): (1, 0),
+    curses.KEY_LEFT: (0, -1), ord('h'): (0, -1),
+    curses.KEY_RIGHT: (0, 1), ord('l'): (0, 1),
+}
 
 def reset_GAME_VARS():
     GAME_VARS['start'] = None
+    GAME_VARS['replay'] = None
     GAME_VARS['wrap'] = None
     GAME_VARS['s_size'] = None
     GAME_VARS['c_prob'] = None
 
 def init_game_state(dimx, dimy, pattern=None):
-    cells = np.zeros((dimy, dimx))
+    cells = np.zeros((dimy, dimx), dtype=np.uint8)
     cells[:pattern.shape[0], :pattern.shape[1]] = pattern
     return cells
 
@@ -42,120 +66,350 @@ def update_game_state(cur, wrap):
     nxt[(working == 1) & ((neighbor_count == 2) | (neighbor_count == 3))] = 1
     nxt[(working == 0) & (neighbor_count == 3)] = 1
 
-    changed_indices = []
-    # When updating, record indices where state changed.
-    for idx, val in np.ndenumerate(nxt):
-        if working[idx] != val:
-            # Use (row,col) indices (each cell is one character)
-            changed_indices.append((idx[0], idx[1]))
-            working[idx] = val
-
     if not wrap:
         nxt = nxt[1:-1, 1:-1]
-        changed_indices = [(y-1, x-1) for y, x in changed_indices]
+
     # Update the provided array so that cur now reflects nxt.
     cur[:] = nxt[:]
-    return cur, changed_indices
+    return cur
 
-def draw_cells(stdscr, cur, changed_indices):
-    # For each cell changed, draw an "O" if alive or a space if dead.
-    max_y, max_x = stdscr.getmaxyx()
-    for y, x in changed_indices:
-        if y < cur.shape[0] and x < cur.shape[1]:
-            char = "O" if cur[y, x] == 1 else " "
-            try:
-                stdscr.addch(y, x, char)
-            except curses.error:
-                pass  # skip positions off-screen
-
-def render_game_info(stdscr, gen, speed):
+def draw_board(stdscr, renderer, cells):
+    # Draw the cells in view above the info line, rewriting only the spans of rows that changed
+    renderer.draw(stdscr, cells, stdscr.getmaxyx()[0] - 1)
+
+def handle_view_key(renderer, key):
+    # Scroll with the arrow and hjkl keys, and notice terminal resizes
+    if key in SCROLL_KEYS:
+        dy, dx = SCROLL_KEYS[key]
+        renderer.scroll(dy * SCROLL_STEP, dx * SCROLL_STEP)
+        return 'moved'
+    if key == curses.KEY_RESIZE:
+        return 'resized'
+    return None
+
+def redraw_view(stdscr, renderer, cells, resized=False):
+    # Draw the scrolled view, clearing the screen first after a resize or over the pause prompt
+    if resized:
+        stdscr.clear()
+        renderer.reset()
+    draw_board(stdscr, renderer, cells)
+
+def switch_mode(stdscr, renderer, cells):
+    # Pack cells into the next character mode, Unicode ones only if the terminal can show them
+    renderer.next_mode(supports_unicode(stdscr))
+    stdscr.clear()
+    draw_board(stdscr, renderer, cells)
+
+def render_game_info(stdscr, gen, speed, cycle=None):
     max_y, max_x = stdscr.getmaxyx()
-    info = f"Generation: {gen}  Speed: {speed} (Use UP/DOWN to adjust, 'p' to pause, 'q' to quit)"
+    info = f"Generation: {gen}  Speed: {speed} (Use +/- to adjust, arrows/hjkl to scroll, 'b'/'w' to step back/rewind, 'c' to save, 'm' to change cell mode, 'p' to pause, 'q' to quit)"
+    if cycle is not None:
+        info = f"Generation: {gen}  Cycle: {describe_cycle(cycle)}  ('p' to pause, 'q' to quit)"
     try:
         stdscr.addstr(max_y-1, 0, info[:max_x-1])
     except curses.error:
         pass
 
-def handle_events(stdscr, clock_speed):
+def handle_events(stdscr, renderer, clock_speed):
     stdscr.nodelay(True)
     key = stdscr.getch()
+    view = handle_view_key(renderer, key)
+    if view is not None:
+        return True, view, clock_speed
     if key == ord('q'):
         return False, 'stopped', clock_speed
     elif key == ord('p'):
         return True, 'paused', clock_speed
-    elif key == curses.KEY_DOWN:
+    elif key == ord('b'):
+        return True, 'back', clock_speed
+    elif key == ord('w'):
+        return True, 'rewind', clock_speed
+    elif key == ord('c'):
+        return True, 'save', clock_speed
+    elif key == ord('m'):
+        return True, 'mode', clock_speed
+    elif key == ord('-'):
         if clock_speed > 1: clock_speed -= 1
         return True, 'running', clock_speed
-    elif key == curses.KEY_UP:
+    elif key in (ord('+'), ord('=')):
         return True, 'running', clock_speed + 1
     return True, 'running', clock_speed
 
-def handle_pause(stdscr):
-    # Display pause prompt and wait until resumed or quit
+def handle_pause(stdscr, renderer):
+    # Display pause prompt and wait until resumed, quit, or the view scrolled or resized
     stdscr.nodelay(False)
     max_y, max_x = stdscr.getmaxyx()
-    prompt = "Paused - press (r) to resume, (s) to restart, (q) to quit."
-    stdscr.addstr(max_y//2, max_x//2 - len(prompt)//2, prompt)
+    prompt = "Paused - press (r) to resume, (b) step back, (w) rewind, (c) save, (s) to restart, (q) to quit."
+    try:
+        stdscr.addstr(max_y//2, max(0, max_x//2 - len(prompt)//2), prompt[:max_x-1])
+    except curses.error:
+        pass
     stdscr.refresh()
     while True:
         key = stdscr.getch()
+        view = handle_view_key(renderer, key)
+        if view is not None:
+            return True, view
         if key == ord('q'):
             return False, 'stopped'
         elif key == ord('r'):
             return True, 'running'
         elif key == ord('s'):
             return True, 'restart'
+        elif key == ord('b'):
+            return True, 'back'
+        elif key == ord('w'):
+            return True, 'rewind'
+        elif key == ord('c'):
+            return True, 'save'
         time.sleep(0.1)
 
-def save_cell_history(current_cells):
-    CELL_HISTORY.append(np.copy(current_cells))
+def rewind_history(stdscr, renderer, history, gen, steps):
+    # Go back up to `steps` generations and redraw the whole board
+    target = max(history.oldest, gen - steps)
+    history.truncate(target)
+    cells = history.get(target)
+    stdscr.clear()
+    renderer.reset()
+    draw_board(stdscr, renderer, cells)
+    return cells, target
+
+def save_game(stdscr, cells, gen, wrap, seed):
+    # Write the running game to the checkpoint and confirm it on the top line
+    save_checkpoint(CHECKPOINT_PATH, cells, gen, wrap, CONWAY, seed)
+    try:
+        stdscr.addstr(0, 0, f"Checkpoint saved at generation {gen}"[:stdscr.getmaxyx()[1] - 1])
+    except curses.error:
+        pass
 
-def game_loop(stdscr, dimx, dimy, wrap, pattern=None):
-    # Initialize game state and configure screen
-    cells = init_game_state(dimx, dimy, pattern)
+def game_loop(stdscr, dimx, dimy, wrap, pattern=None, seed=None, resume=None):
+    # Initialize game state and configure screen, a resumed (cells, generation) stays memory-mapped
+    if resume is None:
+        cells, gen = init_game_state(dimx, dimy, pattern), 0
+    else:
+        cells, gen = resume
     stdscr.clear()
+    renderer = TerminalRenderer(dimx, dimy)
+    draw_board(stdscr, renderer, cells)
     stdscr.nodelay(True)
-    gen = 0
     state = 'running'
     clock_speed = 10  # generations per second
+    detector = CycleDetector()
+    cycle = detector.observe(gen, cells)
+    history = HistoryBuffer(cells.shape, HISTORY_BYTES)
+    history.append(gen, cells)
 
     while True:
-        cont, state, clock_speed = handle_events(stdscr, clock_speed)
+        # Keys are only polled while running, pausing and stepping back take over otherwise
+        if state == 'running':
+            cont, state, clock_speed = handle_events(stdscr, renderer, clock_speed)
         if not cont or state == 'stopped':
+            # Keep the board, it can be resumed from the start menu
+            save_checkpoint(CHECKPOINT_PATH, cells, gen, wrap, CONWAY, seed)
             break
 
-        if state == 'running':
-            cells, changed_indices = update_game_state(cells, wrap)
-            save_cell_history(cells)
-            draw_cells(stdscr, cells, changed_indices)
-            render_game_info(stdscr, gen, clock_speed)
+        if state == 'save':
+            save_game(stdscr, cells, gen, wrap, seed)
+            state = 'running'
+
+        if state == 'mode':
+            switch_mode(stdscr, renderer, cells)
+            render_game_info(stdscr, gen, clock_speed, cycle)
+            state = 'running'
+
+        if state in ('moved', 'resized'):
+            redraw_view(stdscr, renderer, cells, state == 'resized')
+            render_game_info(stdscr, gen, clock_speed, cycle)
             stdscr.refresh()
+            state = 'running'
+
+        if state in ('back', 'rewind'):
+            steps = 1 if state == 'back' else REWIND_STEPS
+            cells, gen = rewind_history(stdscr, renderer, history, gen, steps)
+            detector.reset()
+            cycle = detector.observe(gen, cells)
+            render_game_info(stdscr, gen, clock_speed, cycle)
+            state = 'paused'
+
+        if state == 'running' and cycle is not None and STOP_ON_CYCLE:
+            # Settled, nothing left to step or redraw
+            time.sleep(1/clock_speed)
+        elif state == 'running':
+            cells = update_game_state(cells, wrap)
             gen += 1
+            history.append(gen, cells)
+            cycle = detector.observe(gen, cells)
+            draw_board(stdscr, renderer, cells)
+            render_game_info(stdscr, gen, clock_speed, cycle)
+            stdscr.refresh()
             time.sleep(1/clock_speed)
         elif state == 'paused':
-            cont, new_state = handle_pause(stdscr)
+            cont, new_state = handle_pause(stdscr, renderer)
             if not cont or new_state == 'stopped':
+                save_checkpoint(CHECKPOINT_PATH, cells, gen, wrap, CONWAY, seed)
                 break
+            if new_state == 'save':
+                save_game(stdscr, cells, gen, wrap, seed)
+                continue
+            if new_state in ('moved', 'resized'):
+                redraw_view(stdscr, renderer, cells, True)
+                render_game_info(stdscr, gen, clock_speed, cycle)
+                continue
             if new_state == 'restart':
                 reset_GAME_VARS()
                 main_curses(stdscr)
                 return
-            # Clear prompt before resuming
+            if new_state in ('back', 'rewind'):
+                state = new_state
+                continue
+            # Clear prompt and redraw the board before resuming
             stdscr.clear()
+            renderer.reset()
+            draw_board(stdscr, renderer, cells)
+            state = 'running'
     # End of game loop
     stdscr.nodelay(False)
 
+def render_replay_info(stdscr, replay, record, speed):
+    max_y, max_x = stdscr.getmaxyx()
+    direction = 'backward' if speed < 0 else 'forward'
+    info = (f"Replay {record + 1}/{len(replay)}  Generation: {replay.generations[record]}  "
+            f"Speed: {abs(speed)} records/frame {direction} (+/- to adjust, [/] to seek keyframes, "
+            f"arrows/hjkl to scroll, 'b' to step back, 'm' to change cell mode, 'p' to pause, 'q' to quit)")
+    try:
+        stdscr.move(max_y-1, 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(max_y-1, 0, info[:max_x-1])
+    except curses.error:
+        pass
+
+def handle_replay_events(stdscr, renderer, speed):
+    # speed indexes REPLAY_SPEEDS
+    stdscr.nodelay(True)
+    key = stdscr.getch()
+    view = handle_view_key(renderer, key)
+    if view is not None:
+        return True, view, speed
+    if key == ord('q'):
+        return False, 'stopped', speed
+    elif key == ord('p'):
+        return True, 'paused', speed
+    elif key == ord('b'):
+        return True, 'back', speed
+    elif key == ord('m'):
+        return True, 'mode', speed
+    elif key in (ord('['), ord('w')):
+        return True, 'seek_back', speed
+    elif key == ord(']'):
+        return True, 'seek_forward', speed
+    elif key == ord('-'):
+        return True, 'running', max(speed - 1, 0)
+    elif key in (ord('+'), ord('=')):
+        return True, 'running', min(speed + 1, len(REPLAY_SPEEDS) - 1)
+    return True, 'running', speed
+
+def replay_loop(stdscr, path):
+    # Play a recording back from its keyframes, only the current frame's board is kept
+    replay = Replay(path)
+    record = 0
+    cells = replay.frame(record)
+    stdscr.clear()
+    dimy, dimx = replay.shape
+    renderer = TerminalRenderer(dimx, dimy)
+    draw_board(stdscr, renderer, cells)
+    speed = REPLAY_SPEEDS.index(1)
+    state = 'running'
+    render_replay_info(stdscr, replay, record, REPLAY_SPEEDS[speed])
+    stdscr.refresh()
+
+    while True:
+        if state == 'running':
+            cont, state, speed = handle_replay_events(stdscr, renderer, speed)
+            if not cont or state == 'stopped':
+                break
+
+        if state == 'mode':
+            switch_mode(stdscr, renderer, cells)
+            render_replay_info(stdscr, replay, record, REPLAY_SPEEDS[speed])
+            state = 'running'
+
+        if state in ('moved', 'resized'):
+            redraw_view(stdscr, renderer, cells, state == 'resized')
+            render_replay_info(stdscr, replay, record, REPLAY_SPEEDS[speed])
+            stdscr.refresh()
+            state = 'running'
+
+        target = record
+        if state == 'running':
+            target = min(max(record + REPLAY_SPEEDS[speed], 0), len(replay) - 1)
+        elif state == 'back':
+            target, state = max(record - 1, 0), 'paused'
+        elif state == 'seek_back':
+            target, state = replay.seek_keyframe(record, -1), 'paused'
+        elif state == 'seek_forward':
+            target, state = replay.seek_keyframe(record, 1), 'paused'
+
+        # Draw the rows that differ between the shown frame and the next one, nothing at either end
+        if target != record:
+            cells, record = replay.frame(target), target
+            draw_board(stdscr, renderer, cells)
+            render_replay_info(stdscr, replay, record, REPLAY_SPEEDS[speed])
+            stdscr.refresh()
+
+        if state == 'running':
+            time.sleep(1/REPLAY_FPS)
+        elif state == 'paused':
+            # 'b' steps back one record and 'w' seeks back a keyframe, saving is left to the live game
+            cont, new_state = handle_pause(stdscr, renderer)
+            if not cont or new_state == 'stopped':
+                break
+            if new_state == 'restart':
+                replay.close()
+                reset_GAME_VARS()
+                main_curses(stdscr)
+                return
+            if new_state in ('back', 'rewind'):
+                state = 'back' if new_state == 'back' else 'seek_back'
+                continue
+            if new_state == 'save':
+                continue
+            if new_state in ('moved', 'resized'):
+                redraw_view(stdscr, renderer, cells, True)
+                render_replay_info(stdscr, replay, record, REPLAY_SPEEDS[speed])
+                continue
+            # Clear prompt and redraw the board before resuming
+            stdscr.clear()
+            renderer.reset()
+            draw_board(stdscr, renderer, cells)
+            render_replay_info(stdscr, replay, record, REPLAY_SPEEDS[speed])
+            state = 'running'
+    replay.close()
+    stdscr.nodelay(False)
+
 def start_menu(stdscr):
     stdscr.clear()
     msg = "Conway's Game of Life. Press (s) to Start, (q) to Quit."
+    can_resume = checkpoint_exists(CHECKPOINT_PATH)
+    recording = latest_recording(RECORD_DIR)
+    if can_resume:
+        msg = msg.replace(", (q)", ", (c) to Continue the saved game, (q)")
+    if recording is not None:
+        msg = msg.replace(", (q)", ", (v) to View the newest replay, (q)")
     max_y, max_x = stdscr.getmaxyx()
-    stdscr.addstr(max_y//2, max_x//2 - len(msg)//2, msg)
+    stdscr.addstr(max_y//2, max(0, max_x//2 - len(msg)//2), msg[:max_x-1])
     stdscr.refresh()
     while True:
         key = stdscr.getch()
         if key == ord('s'):
             GAME_VARS['start'] = True
             return
+        elif key == ord('c') and can_resume:
+            GAME_VARS['start'] = 'resume'
+            return
+        elif key == ord('v') and recording is not None:
+            GAME_VARS['start'] = 'replay'
+            GAME_VARS['replay'] = recording
+            return
         elif key == ord('q'):
             exit()
 
@@ -214,6 +468,15 @@ def game_logic(stdscr):
     # Run menus in sequence if values are not set
     if GAME_VARS['start'] is None:
         start_menu(stdscr)
+    if GAME_VARS['start'] == 'resume':
+        # Continue the saved game, its board stays memory-mapped
+        cells, meta = load_checkpoint(CHECKPOINT_PATH)
+        dimy, dimx = cells.shape
+        game_loop(stdscr, dimx, dimy, meta['wrap'], seed=meta['seed'], resume=(cells, meta['generation']))
+        return
+    if GAME_VARS['start'] == 'replay':
+        replay_loop(stdscr, GAME_VARS['replay'])
+        return
     if GAME_VARS['wrap'] is None:
         wrap_menu(stdscr)
     if GAME_VARS['s_size'] is None:
@@ -225,9 +488,27 @@ def game_logic(stdscr):
     n = GAME_VARS['s_size']
     m = GAME_VARS['s_size']
     probability = GAME_VARS['c_prob']
-    # Create a random board.
-    pattern = np.random.choice([0, 1], size=(n, m), p=[1 - probability, probability])
-    game_loop(stdscr, m, n, GAME_VARS['wrap'], pattern=pattern)
+    try:
+        warning = check_memory_budget(m, n, density=probability)
+    except MemoryError as err:
+        # World would not fit, explain and pick another size
+        stdscr.clear()
+        stdscr.addstr(0, 0, str(err)[:stdscr.getmaxyx()[1] - 1])
+        stdscr.refresh()
+        time.sleep(3)
+        GAME_VARS['s_size'] = None
+        game_logic(stdscr)
+        return
+    if warning is not None:
+        # World fits but only just, say so before starting
+        stdscr.clear()
+        stdscr.addstr(0, 0, warning[:stdscr.getmaxyx()[1] - 1])
+        stdscr.refresh()
+        time.sleep(2)
+    # Create a random uint8 board, from a seed recorded in checkpoints.
+    seed = new_seed()
+    pattern = random_pattern(n, m, probability, seed)
+    game_loop(stdscr, m, n, GAME_VARS['wrap'], pattern=pattern, seed=seed)
 
 def main_curses(stdscr):
     curses.curs_set(0)
@@ -240,4 +521,5 @@ def main_curses(stdscr):
 
 if __name__ == '__main__':
     # windows-curses must be installed in your environment
+    locale.setlocale(locale.LC_ALL, '')  # Lets curses write the half-block and Braille characters
     curses.wrapper(main_curses)
@@ -0,0 +1,105 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Cycle and still-life detection for the Game of Life
+# ---------------------------------------------------------------------------
+# Random soups settle into still lifes and short oscillators. Instead of
+# keeping whole boards around, every generation is reduced to a 64-bit hash
+# of the bit-packed grid, and only the hashes of the last `window`
+# generations are kept. A hash repeating p generations later is a candidate
+# cycle of period p; it is confirmed once the next p generations repeat too
+# (for a still life, p = 1, the first repeat confirms it).
+#
+# Onset is the first generation of the cycle: the earliest generation whose
+# state comes back p generations later.
+#
+# Engines that keep the board in their own form are hashed from that state
+# (see state_hash) instead of a dense copy: the bit-packed words, the front
+# buffer, or the sorted living-cell coordinates of the sparse engines. For
+# the unbounded sparse engine that also means cells outside any window still
+# count, so a spaceship is never taken for a still life.
+# ---------------------------------------------------------------------------
+
+import zlib
+from collections import deque
+from hashlib import blake2b
+
+import numpy as np
+
+CYCLE_WINDOW = 64   # Generations of hashes kept, so the longest period detected
+
+
+def board_hash(cells):
+    """Return a 64-bit hash of a board, from its bit-packed cells and shape."""
+    digest = blake2b(np.asarray(cells.shape, dtype=np.int64).tobytes(), digest_size=8)
+    digest.update(np.packbits(cells != 0).tobytes())
+    return int.from_bytes(digest.digest(), 'little')
+
+def state_hash(state):
+    """Return a 64-bit hash of an engine's state() array, from its bytes, dtype and shape.
+
+    The CRC-32 and Adler-32 of the bytes side by side: both run several times
+    faster than blake2b, which matters when every generation of the fastest
+    engines is hashed.
+    """
+    state = np.ascontiguousarray(state)
+    data = memoryview(state).cast('B')
+    seed = f'{state.dtype.str}{state.shape}'.encode('ascii')
+    return zlib.crc32(data, zlib.crc32(seed)) | zlib.adler32(data, zlib.adler32(seed)) << 32
+
+class CycleDetector:
+    """Watch the board hash of each generation and report confirmed cycles."""
+
+    def __init__(self, window=CYCLE_WINDOW):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        """Forget all history, e.g. after the board was changed by a jump."""
+        self.hashes = deque()   # (generation, hash), oldest first
+        self.seen = {}          # hash -> latest generation it was seen at
+        self.candidate = None   # (onset, period) waiting for confirmation
+        self.matches = 0        # generations that repeated the candidate so far
+        self.cycle = None       # confirmed (onset, period)
+
+    def observe(self, gen, cells=None, key=None):
+        """Record the board at generation gen and return (onset, period) once a cycle is confirmed.
+
+        key is the state's hash when it is not a dense board (see state_hash).
+        """
+        if self.cycle is not None:
+            return self.cycle
+
+        if key is None:
+            key = board_hash(cells)
+        last = self.seen.get(key)
+        period = None if last is None else gen - last
+
+        if period is not None and self.candidate is not None and period == self.candidate[1]:
+            self.matches += 1
+        elif period is not None:
+            self.candidate = (last, period)
+            self.matches = 1
+        else:
+            self.candidate = None
+            self.matches = 0
+
+        if self.candidate is not None and self.matches >= self.candidate[1]:
+            self.cycle = self.candidate
+
+        # Keep only the hashes of the last `window` generations
+        self.hashes.append((gen, key))
+        self.seen[key] = gen
+        while self.hashes and self.hashes[0][0] <= gen - self.window:
+            old_gen, old_key = self.hashes.popleft()
+            if self.seen.get(old_key) == old_gen:
+                del self.seen[old_key]
+        return self.cycle
+
+def describe_cycle(cycle):
+    """Describe a (onset, period) cycle for the HUD and reports."""
+    if cycle is None:
+        return "none detected"
+    onset, period = cycle
+    if period == 1:
+        return f"still life since generation {onset}"
+    return f"period {period} since generation {onset}"
@@ -0,0 +1,215 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Simulation core for Conway's Game of Life, shared by the front-ends
+# ---------------------------------------------------------------------------
+# Holds board initialization and stepping without importing pygame or
+# curses, so simulations can also run headless (see gameOfLife_headless.py).
+# Engines wrap a board and a stepping method behind the same small API:
+#   step()        advance one generation, return the (births, deaths) counts
+#   population()  number of living cells
+#   get_cells()   the board as a dense (dimy, dimx) array
+# Engines holding external resources (worker processes) also have close().
+# Engines keeping the board in another form also have state(), an array that
+# determines the board, which the cycle detector hashes instead of a dense copy.
+# ---------------------------------------------------------------------------
+
+import os
+
+import numpy as np
+
+from gameOfLife_bitpacked import BitPackedEngine
+from gameOfLife_buffered import BufferedEngine
+from gameOfLife_parallel import ParallelEngine
+from gameOfLife_patterns import load_pattern
+from gameOfLife_rules import CONWAY, compile_rule, is_conway
+from gameOfLife_sparse import SparseEngine, UnboundedSparseEngine
+from gameOfLife_tiles import TiledEngine
+
+# Directory holding the glider CSV patterns
+PATTERN_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Rows of the random board generated at a time, bounds the float temporaries
+RANDOM_CHUNK_ROWS = 1024
+
+# Approximate peak working memory of each engine in bytes per board cell,
+# board included (measured with tracemalloc). The sparse engines scale with
+# the population instead, see SPARSE_BYTES_PER_LIVE_CELL.
+ENGINE_BYTES_PER_CELL = {
+    'numpy': 10,
+    'bitpacked': 4,
+    'buffered': 5,
+    'tiled': 14,
+    'parallel': 12,
+}
+SPARSE_BYTES_PER_LIVE_CELL = 220
+MEMORY_WARN_FRACTION = 0.5  # Warn when a run needs more than this share of free memory
+
+def init_game_state(dimx, dimy, pattern=None, glider_count=None):
+    """Initialize the game state with specified dimensions and pattern."""
+
+    # Create an empty grid of specified dimensions
+    cells = np.zeros((dimy, dimx), dtype=np.uint8)
+    if glider_count == 1:
+        # Initialize with Gosper's glider gun (parsed once, then cached)
+        pattern = load_pattern(os.path.join(PATTERN_DIR, "glider.csv"))
+        
+    elif glider_count == 2:
+        # Initialize with two Gosper's glider guns
+        pattern = load_pattern(os.path.join(PATTERN_DIR, "gliders.csv"))
+        
+    if (glider_count == 1 or glider_count == 2):
+        # Position the pattern in the game grid
+        pos = (3,3) # Position where the pattern starts
+        cells[pos[0]:pos[0]+pattern.shape[0], pos[1]:pos[1]+pattern.shape[1]] = pattern
+    
+    else:
+        cells[:pattern.shape[0], :pattern.shape[1]] = pattern
+    
+    return cells
+
+def update_game_state(cur, wrap, rule=CONWAY):
+    """Update the game state for the next generation."""
+    
+    # Pad the current array if wrap is False
+    if not wrap:
+        cur = np.pad(cur, pad_width=1, mode='constant') 
+
+    # Use Numpy array operations for neighbor counting and updating
+    neighbor_count = (
+        np.roll(cur, (-1, -1), axis=(0, 1)) + 
+        np.roll(cur, (-1, 0), axis=(0, 1)) + 
+        np.roll(cur, (-1, 1), axis=(0, 1)) + 
+        np.roll(cur, (0, -1), axis=(0, 1)) + 
+        np.roll(cur, (0, 1), axis=(0, 1)) + 
+        np.roll(cur, (1, -1), axis=(0, 1)) + 
+        np.roll(cur, (1, 0), axis=(0, 1)) + 
+        np.roll(cur, (1, 1), axis=(0, 1))
+    )
+
+    # Apply the rule with one gather from its (state, neighbor count) table
+    nxt = compile_rule(rule).take(cur * 9 + neighbor_count)
+
+    # Drop the padding if wrap is False
+    if not wrap:
+        cur = cur[1:-1, 1:-1]
+        nxt = nxt[1:-1, 1:-1]
+
+    # Return the next generation array and changed cells
+    return nxt, find_changes(cur, nxt)
+
+def find_changes(cur, nxt):
+    """Return the cells born and the cells that died as (rows, cols) index arrays."""
+    births = np.nonzero((nxt == 1) & (cur == 0))
+    deaths = np.nonzero((nxt == 0) & (cur == 1))
+    return births, deaths
+
+def random_pattern(n, m, probability, seed=None):
+    """Create a random (n, m) uint8 pattern where each cell is alive with the given probability."""
+    rng = np.random.default_rng(seed)
+    pattern = np.empty((n, m), dtype=np.uint8)
+
+    # Draw in row chunks so the float32 samples never cover the whole board
+    for y in range(0, n, RANDOM_CHUNK_ROWS):
+        rows = pattern[y:y + RANDOM_CHUNK_ROWS]
+        np.less(rng.random(rows.shape, dtype=np.float32), probability, out=rows, casting='unsafe')
+    return pattern
+
+def new_seed():
+    """Draw a fresh seed for random_pattern, so the board can be recorded and recreated."""
+    return int(np.random.SeedSequence().entropy % 2 ** 32)
+
+def estimate_memory(dimx, dimy, engine='numpy', density=0.5):
+    """Estimate the peak working memory in bytes of running a dimx by dimy world."""
+    cells = dimx * dimy
+    if engine.startswith('sparse'):
+        working = cells * density * SPARSE_BYTES_PER_LIVE_CELL
+    else:
+        working = cells * ENGINE_BYTES_PER_CELL[engine]
+
+    # The uint8 starting board is alive alongside the engine while it is built
+    return int(cells + working)
+
+def available_memory():
+    """Return the memory available to a new run in bytes, or None if unknown."""
+    try:
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def check_memory_budget(dimx, dimy, engine='numpy', density=0.5):
+    """Refuse a world that would not fit in memory, and warn when it is close.
+
+    Raises MemoryError when the estimate exceeds the available memory.
+    Otherwise returns a warning for the front-end to show when the world
+    needs more than MEMORY_WARN_FRACTION of it, or None.
+    """
+    needed = estimate_memory(dimx, dimy, engine, density)
+    available = available_memory()
+    if available is None:
+        return None
+
+    if needed > available:
+        raise MemoryError(f"A {dimx}x{dimy} world needs about {needed / 2**20:.0f} MiB "
+                          f"with the {engine} engine, only {available / 2**20:.0f} MiB is available")
+    if needed > available * MEMORY_WARN_FRACTION:
+        return (f"A {dimx}x{dimy} world needs about {needed / 2**20:.0f} MiB "
+                f"of the {available / 2**20:.0f} MiB available")
+    return None
+
+class NumpyEngine:
+    """Keep a dense board and step it with update_game_state."""
+
+    def __init__(self, cells, wrap, rule=CONWAY):
+        self.cells = cells
+        self.wrap = wrap
+        self.rule = rule
+
+    def step_cells(self):
+        """Advance one generation and return the births and deaths as (rows, cols) arrays."""
+        self.cells, changes = update_game_state(self.cells, self.wrap, self.rule)
+        return changes
+
+    def step(self):
+        """Advance one generation and return the (births, deaths) counts."""
+        births, deaths = self.step_cells()
+        return len(births[0]), len(deaths[0])
+
+    def population(self):
+        """Count the living cells."""
+        return int(np.count_nonzero(self.cells))
+
+    def get_cells(self):
+        """Return the board as a dense array."""
+        return self.cells
+
+# Available stepping engines, by name
+ENGINES = {
+    'numpy': NumpyEngine,
+    'bitpacked': BitPackedEngine,
+    'buffered': BufferedEngine,
+    'tiled': TiledEngine,
+    'sparse': SparseEngine,
+    'sparse-unbounded': UnboundedSparseEngine,
+    'parallel': ParallelEngine,
+}
+
+# Engines that run any life-like rule, the others only run Conway's
+RULE_ENGINES = ('numpy', 'tiled', 'buffered')
+
+def make_engine(name, cells, wrap, rule=CONWAY):
+    """Create the named engine around an initial board."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine '{name}', expected one of: {', '.join(ENGINES)}")
+    if name in RULE_ENGINES:
+        return ENGINES[name](cells, wrap, rule=rule)
+    if not is_conway(rule):
+        raise ValueError(f"The {name} engine only runs Conway's rules, "
+                         f"use one of {', '.join(RULE_ENGINES)} for {rule}")
+    return ENGINES[name](cells, wrap)
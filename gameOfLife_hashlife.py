@@ -0,0 +1,300 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# HashLife engine for the Game of Life
+# ---------------------------------------------------------------------------
+# Stores the board as a quadtree of canonical nodes: every distinct 2^k x 2^k
+# block exists once, so the very regular Gosper gun patterns share almost all
+# of their structure. The result of advancing a node is memoized, which lets
+# step_pow2(k) jump 2^k generations in a single call.
+#
+# The HashLife plane is unbounded. Dense boards are imported at the origin and
+# exported by cropping a window, so cells that leave the window (or would have
+# wrapped around it on a dense board) are not seen again in that window.
+# jump_ahead therefore only jumps while the pattern cannot reach the window
+# edge: light speed is one cell per generation, so a pattern with m empty
+# rows and columns around it evolves the same on the plane, on a bounded board
+# and on a torus for m generations. It stops early once the pattern reaches
+# the edge and reports how far it got.
+#
+# Memory is bounded by a generation-style collector: once the node table and
+# the memo together exceed max_nodes, everything not reachable from the
+# current root is dropped between calls.
+#
+# Any life-like rule works except the B0 ones: those turn empty space alive,
+# so the empty nodes the quadtree is padded with would no longer stay empty.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+
+from gameOfLife_rules import CONWAY, parse_rule
+
+MAX_NODES = 1_000_000
+
+
+class Node:
+    """A canonical quadtree node covering 2**level x 2**level cells."""
+
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw=None, ne=None, sw=None, se=None, population=0):
+        self.level = level
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.population = population
+
+class HashLife:
+    """Quadtree HashLife universe with canonical nodes and memoized successors."""
+
+    def __init__(self, max_nodes=MAX_NODES, rule=CONWAY):
+        self.birth, self.survive = parse_rule(rule)
+        if 0 in self.birth:
+            raise ValueError(f"HashLife cannot run the B0 rule '{rule}', empty space would not stay empty")
+        self.max_nodes = max_nodes
+        self.nodes = {}     # (nw, ne, sw, se) -> canonical node
+        self.memo = {}      # (node, j) -> node advanced 2**j generations
+        self.off = Node(0, population=0)
+        self.on = Node(0, population=1)
+        self.empties = [self.off]
+        self.root = self.empty(3)
+        self.origin = (0, 0)    # (x, y) of the root's top-left cell
+        self.generation = 0
+
+    def join(self, nw, ne, sw, se):
+        """Return the canonical node with the given four quadrants."""
+        key = (nw, ne, sw, se)
+        node = self.nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self.nodes[key] = node
+        return node
+
+    def empty(self, level):
+        """Return the canonical empty node of a level."""
+        while len(self.empties) <= level:
+            e = self.empties[-1]
+            self.empties.append(self.join(e, e, e, e))
+        return self.empties[level]
+
+    def _centre(self, node):
+        """Embed a node in the middle of an empty node one level up."""
+        e = self.empty(node.level - 1)
+        return self.join(self.join(e, e, e, node.nw), self.join(e, e, node.ne, e),
+                         self.join(e, node.sw, e, e), self.join(node.se, e, e, e))
+
+    def _is_padded(self, node):
+        """Check that all living cells sit in the central half of a node."""
+        return (node.nw.population == node.nw.se.population and
+                node.ne.population == node.ne.sw.population and
+                node.sw.population == node.sw.ne.population and
+                node.se.population == node.se.nw.population)
+
+    def _life_4x4(self, node):
+        """Advance the centre 2x2 of a level 2 node by one generation."""
+        grid = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        cells = [[leaf.population for leaf in row] for row in grid]
+
+        def rule(y, x):
+            neighbors = sum(cells[y + dy][x + dx]
+                            for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx)
+            alive = neighbors in (self.survive if cells[y][x] else self.birth)
+            return self.on if alive else self.off
+
+        return self.join(rule(1, 1), rule(1, 2), rule(2, 1), rule(2, 2))
+
+    def _successor(self, node, j):
+        """Return the centre of a node (one level down) advanced 2**j generations."""
+        if node.population == 0:
+            return self.empty(node.level - 1)
+        if node.level == 2:
+            return self._life_4x4(node)
+
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self.memo.get(key)
+        if result is not None:
+            return result
+
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        join, succ = self.join, self._successor
+
+        # Nine overlapping sub-squares one level down, each advanced first
+        c1 = succ(nw, j)
+        c2 = succ(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+        c3 = succ(ne, j)
+        c4 = succ(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+        c5 = succ(join(nw.se, ne.sw, sw.ne, se.nw), j)
+        c6 = succ(join(ne.sw, ne.se, se.nw, se.ne), j)
+        c7 = succ(sw, j)
+        c8 = succ(join(sw.ne, se.nw, sw.se, se.sw), j)
+        c9 = succ(se, j)
+
+        if j < node.level - 2:
+            # Already advanced far enough, only re-centre the pieces
+            result = join(join(c1.se, c2.sw, c4.ne, c5.nw),
+                          join(c2.se, c3.sw, c5.ne, c6.nw),
+                          join(c4.se, c5.sw, c7.ne, c8.nw),
+                          join(c5.se, c6.sw, c8.ne, c9.nw))
+        else:
+            # Full speed: advance the four combined quadrants a second time
+            result = join(succ(join(c1, c2, c4, c5), j),
+                          succ(join(c2, c3, c5, c6), j),
+                          succ(join(c4, c5, c7, c8), j),
+                          succ(join(c5, c6, c8, c9), j))
+
+        self.memo[key] = result
+        return result
+
+    def _build(self, block, level):
+        """Build the node for a 2**level square block of a dense board."""
+        if not block.any():
+            return self.empty(level)
+        if level == 0:
+            return self.on
+        half = 1 << (level - 1)
+        return self.join(self._build(block[:half, :half], level - 1),
+                         self._build(block[:half, half:], level - 1),
+                         self._build(block[half:, :half], level - 1),
+                         self._build(block[half:, half:], level - 1))
+
+    def load(self, cells, x=0, y=0):
+        """Replace the universe with a dense (dimy, dimx) board placed at (x, y)."""
+        dimy, dimx = cells.shape
+        level = max(3, int(np.ceil(np.log2(max(dimy, dimx, 1)))))
+        square = np.zeros((1 << level, 1 << level), dtype=bool)
+        square[:dimy, :dimx] = cells != 0
+        self.root = self._build(square, level)
+        self.origin = (x, y)
+
+    def _paint(self, node, nx, ny, out, x, y):
+        """Copy the living cells of a node at (nx, ny) into the window at (x, y)."""
+        size = 1 << node.level
+        h, w = out.shape
+        if (node.population == 0 or nx >= x + w or ny >= y + h or
+                nx + size <= x or ny + size <= y):
+            return
+        if node.level == 0:
+            out[ny - y, nx - x] = 1
+            return
+        half = size >> 1
+        self._paint(node.nw, nx, ny, out, x, y)
+        self._paint(node.ne, nx + half, ny, out, x, y)
+        self._paint(node.sw, nx, ny + half, out, x, y)
+        self._paint(node.se, nx + half, ny + half, out, x, y)
+
+    def to_dense(self, dimx, dimy, x=0, y=0):
+        """Export the (dimy, dimx) window with top-left cell (x, y) as a dense board."""
+        out = np.zeros((dimy, dimx), dtype=np.uint8)
+        self._paint(self.root, self.origin[0], self.origin[1], out, x, y)
+        return out
+
+    def _grow(self):
+        """Embed the root one level up, keeping its cells in place."""
+        half = 1 << (self.root.level - 1)
+        self.root = self._centre(self.root)
+        self.origin = (self.origin[0] - half, self.origin[1] - half)
+
+    def step_pow2(self, k):
+        """Advance the universe by 2**k generations in a single call."""
+
+        # Grow until the pattern cannot reach the edge of the result
+        while self.root.level < k + 2 or not self._is_padded(self.root):
+            self._grow()
+        self._grow()
+
+        quarter = 1 << (self.root.level - 2)
+        self.root = self._successor(self.root, k)
+        self.origin = (self.origin[0] + quarter, self.origin[1] + quarter)
+        self.generation += 1 << k
+
+        if len(self.nodes) + len(self.memo) > self.max_nodes:
+            self.collect()
+
+    def advance(self, generations):
+        """Advance the universe by any number of generations."""
+        k = 0
+        while generations:
+            if generations & 1:
+                self.step_pow2(k)
+            generations >>= 1
+            k += 1
+
+    def collect(self):
+        """Drop every node not reachable from the root, and all memoized results."""
+        kept = {}
+        stack = [self.root] + self.empties[1:]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in kept:
+                continue
+            kept[key] = node
+            stack.extend(key)
+        self.nodes = kept
+        self.memo = {}
+
+    def population(self):
+        """Count the living cells."""
+        return self.root.population
+
+    def _extent(self, node, cache):
+        """Return the (x0, y0, x1, y1) box of a node's living cells relative to its corner."""
+        if node.level == 0:
+            return (0, 0, 1, 1)
+        box = cache.get(node)
+        if box is None:
+            half = 1 << (node.level - 1)
+            boxes = []
+            for child, dx, dy in ((node.nw, 0, 0), (node.ne, half, 0), (node.sw, 0, half), (node.se, half, half)):
+                if child.population:
+                    x0, y0, x1, y1 = self._extent(child, cache)
+                    boxes.append((x0 + dx, y0 + dy, x1 + dx, y1 + dy))
+            box = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                   max(b[2] for b in boxes), max(b[3] for b in boxes))
+            cache[node] = box
+        return box
+
+    def bounds(self):
+        """Return the (x0, y0, x1, y1) box of the living cells, x1 and y1 exclusive, or None when empty."""
+        if self.root.population == 0:
+            return None
+        x0, y0, x1, y1 = self._extent(self.root, {})
+        ox, oy = self.origin
+        return (x0 + ox, y0 + oy, x1 + ox, y1 + oy)
+
+def edge_margin(bounds, dimx, dimy):
+    """Return how many generations a pattern in bounds can run before reaching the window edge."""
+    if bounds is None:
+        return None
+    x0, y0, x1, y1 = bounds
+    return max(min(x0, y0, dimx - x1, dimy - y1), 0)
+
+def jump_ahead(cells, k, life=None):
+    """Advance a dense board by up to 2**k generations, returning (board, generations advanced).
+
+    The jump is exact for both wrapping and bounded boards, so it stops short
+    once the pattern reaches the window edge. Pass the same HashLife instance
+    across calls to reuse its memoized nodes.
+    """
+    life = HashLife() if life is None else life
+    life.load(cells)
+    dimy, dimx = cells.shape
+    remaining = 1 << k
+    while remaining:
+        margin = edge_margin(life.bounds(), dimx, dimy)
+        if margin is None:
+            remaining = 0   # An empty board stays empty
+            break
+        step = min(margin, remaining)
+        if step == 0:
+            break
+        j = step.bit_length() - 1
+        life.step_pow2(j)
+        remaining -= 1 << j
+    return life.to_dense(dimx, dimy), (1 << k) - remaining
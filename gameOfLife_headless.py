@@ -0,0 +1,270 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Headless batch simulation of the Game of Life
+# ---------------------------------------------------------------------------
+# Runs without pygame or a display: steps the board at full speed with no
+# rendering or tick throttling, then writes the final board and the
+# per-generation statistics to disk and reports generations per second.
+# Still lifes and short cycles are detected on the way and reported, and
+# --stop-on-cycle ends the run as soon as one is confirmed.
+#
+# --checkpoint writes a memory-mapped checkpoint at the end of the run (and
+# every --checkpoint-every generations); --resume continues from one, keeping
+# its generation count, wrap setting, rule and seed.
+#
+# --record streams every generation to a replay file (see
+# gameOfLife_recorder.py) from a background writer thread.
+#
+# Example:
+#   python gameOfLife_headless.py --size 500 --c-prob 0.25 --seed 1 --generations 5000
+#   python gameOfLife_headless.py --glider-count 2 --no-wrap --generations 1000
+#   python gameOfLife_headless.py --rule HighLife --engine buffered --generations 2000
+#   python gameOfLife_headless.py --size 100 --generations 100000 --stop-on-cycle
+#   python gameOfLife_headless.py --pattern patterns/breeder.rle --size 2000 --engine sparse
+#   python gameOfLife_headless.py --size 4000 --generations 500 --checkpoint checkpoints/big
+#   python gameOfLife_headless.py --resume checkpoints/big --generations 500 --checkpoint checkpoints/big
+#   python gameOfLife_headless.py --size 1000 --generations 2000 --record recordings/run.golr
+# ---------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from gameOfLife_checkpoint import load_checkpoint, save_checkpoint
+from gameOfLife_cycles import CycleDetector, describe_cycle, state_hash
+from gameOfLife_engine import (ENGINES, check_memory_budget, init_game_state, make_engine, new_seed,
+                               random_pattern)
+from gameOfLife_patterns import load_pattern, pattern_rule
+from gameOfLife_recorder import Recorder
+from gameOfLife_rules import CONWAY, RULES, rule_name
+
+# Same settings as the pygame GAME_VARS, plus the headless only ones
+RUN_VARS = {
+    'wrap': True,           # Wrap cells flag
+    'glider_count': None,   # Number of glider guns (1 or 2), None for a random board
+    'pattern': None,        # .rle, .cells or .csv pattern file to start from instead
+    's_size': 100,          # World size
+    'c_prob': 0.25,         # Probability of cells being alive initially
+    'seed': None,           # Seed for the random board
+    'generations': 1000,    # Number of generations to run
+    'engine': 'numpy',      # Stepping engine, see gameOfLife_engine.ENGINES
+    'rule': None,           # Rule name or B/S rulestring (see gameOfLife_rules.RULES), None for the pattern's or Conway's
+    'detect_cycles': True,  # Watch for still lifes and short cycles
+    'stop_on_cycle': False, # End the run once a cycle is confirmed
+    'out_dir': 'headless_output',  # Directory for the final board and statistics
+    'resume': None,         # Checkpoint to continue from
+    'checkpoint': None,     # Checkpoint to write at the end of the run
+    'checkpoint_every': 0,  # Also write the checkpoint every this many generations (0: only at the end)
+    'record': None,         # Replay file to stream every generation to
+}
+
+def check_memory(dimx, dimy, engine, density):
+    """Refuse a world that would not fit in memory, and print a warning to stderr when it is close."""
+    warning = check_memory_budget(dimx, dimy, engine, density=density)
+    if warning is not None:
+        print(f"Warning: {warning}", file=sys.stderr)
+
+def build_board(run_vars):
+    """Create the starting board the same way the pygame front-end does, or resume a checkpoint.
+
+    Returns the board and its generation. Resuming takes the wrap setting, rule
+    and seed over from the checkpoint into run_vars.
+    """
+    if run_vars['resume'] is not None:
+        cells, meta = load_checkpoint(run_vars['resume'])
+        check_memory(cells.shape[1], cells.shape[0], run_vars['engine'], run_vars['c_prob'])
+        run_vars.update(wrap=meta['wrap'], rule=meta['rule'], seed=meta['seed'])
+        return cells, meta['generation']
+
+    if run_vars['rule'] is None:
+        # An .rle pattern's own rule, unless --rule was given
+        run_vars['rule'] = (pattern_rule(run_vars['pattern']) if run_vars['pattern'] else None) or CONWAY
+
+    if run_vars['glider_count'] in (1, 2):
+        # Glider guns always run on the 120x90 board
+        return init_game_state(120, 90, glider_count=run_vars['glider_count']), 0
+
+    if run_vars['pattern'] is not None:
+        # Placed like the glider guns, on a board grown to fit when it is too small
+        pattern = load_pattern(run_vars['pattern'])
+        n = max(run_vars['s_size'], pattern.shape[0] + 6)
+        m = max(run_vars['s_size'], pattern.shape[1] + 6)
+        check_memory(m, n, run_vars['engine'], pattern.mean())
+        cells = np.zeros((n, m), dtype=np.uint8)
+        cells[3:3 + pattern.shape[0], 3:3 + pattern.shape[1]] = pattern
+        return cells, 0
+
+    n = m = run_vars['s_size']
+    check_memory(n, m, run_vars['engine'], run_vars['c_prob'])
+    if run_vars['seed'] is None:
+        run_vars['seed'] = new_seed()   # Recorded in checkpoints
+    pattern = random_pattern(n, m, run_vars['c_prob'], run_vars['seed'])
+    return init_game_state(n, m, pattern), 0
+
+def write_checkpoint(run_vars, cells, gen):
+    """Write the run's checkpoint for generation gen."""
+    return save_checkpoint(run_vars['checkpoint'], cells, gen, run_vars['wrap'], run_vars['rule'],
+                           run_vars['seed'])
+
+def observe_cycle(detector, gen, engine):
+    """Feed the detector the engine's own state when it has one, else its dense board.
+
+    That skips unpacking a bit-packed board every generation, and the
+    unbounded sparse engine's board is only a window: a pattern leaving it
+    would look like a blank still life.
+    """
+    if hasattr(engine, 'state'):
+        return detector.observe(gen, key=state_hash(engine.state()))
+    return detector.observe(gen, engine.get_cells())
+
+def run_simulation(run_vars):
+    """Step the board for the requested generations and collect statistics."""
+    cells, first = build_board(run_vars)
+    engine = make_engine(run_vars['engine'], cells, run_vars['wrap'], run_vars['rule'])
+    detector = CycleDetector() if run_vars['detect_cycles'] else None
+    cycle = None if detector is None else observe_cycle(detector, first, engine)
+    every = run_vars['checkpoint_every'] if run_vars['checkpoint'] else 0
+    recorder = None
+
+    # One row per generation: generation, population, births, deaths
+    generations = run_vars['generations']
+    stats = np.zeros((generations + 1, 4), dtype=np.int64)
+    stats[0] = (first, engine.population(), 0, 0)
+
+    try:
+        if run_vars['record']:
+            os.makedirs(os.path.dirname(run_vars['record']) or '.', exist_ok=True)
+            recorder = Recorder(run_vars['record'], cells.shape, run_vars['wrap'], run_vars['rule'],
+                                run_vars['seed'])
+            recorder.record(first, cells)
+        start = time.perf_counter()
+        for i in range(1, generations + 1):
+            if recorder is not None and hasattr(engine, 'step_cells'):
+                # Record from the births and deaths, the board is only copied for keyframes
+                changes = engine.step_cells()
+                births, deaths = len(changes[0][0]), len(changes[1][0])
+            else:
+                changes = None
+                births, deaths = engine.step()
+            gen = first + i
+            stats[i, 0] = gen
+            stats[i, 2] = births
+            stats[i, 3] = deaths
+            if recorder is not None:
+                recorder.record(gen, engine.get_cells(), changes)
+            if every and i % every == 0 and i < generations:
+                write_checkpoint(run_vars, engine.get_cells(), gen)
+            if detector is not None and cycle is None:
+                cycle = observe_cycle(detector, gen, engine)
+                if cycle is not None and run_vars['stop_on_cycle']:
+                    stats = stats[:i + 1]
+                    break
+        elapsed = time.perf_counter() - start
+        cells = engine.get_cells()
+        if run_vars['checkpoint']:
+            write_checkpoint(run_vars, cells, stats[-1, 0])
+    finally:
+        if hasattr(engine, 'close'):
+            engine.close()
+        if recorder is not None:
+            recorder.close()
+
+    # Population follows from the births and deaths of each generation
+    stats[1:, 1] = stats[0, 1] + np.cumsum(stats[1:, 2] - stats[1:, 3])
+
+    return cells, stats, elapsed, cycle
+
+def write_results(out_dir, cells, stats):
+    """Write the final board and the statistics table to out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    board_path = os.path.join(out_dir, 'final_board.npy')
+    stats_path = os.path.join(out_dir, 'stats.csv')
+    np.save(board_path, cells)
+    np.savetxt(stats_path, stats, fmt='%d', delimiter=',',
+               header='generation,population,births,deaths', comments='')
+    return board_path, stats_path
+
+def parse_args(argv=None):
+    """Parse command line options into a RUN_VARS style dict."""
+    parser = argparse.ArgumentParser(description="Run the Game of Life without a display.")
+    parser.add_argument('--size', type=int, default=RUN_VARS['s_size'], help='world size (square)')
+    parser.add_argument('--wrap', action=argparse.BooleanOptionalAction, default=RUN_VARS['wrap'],
+                        help='wrap cells around the edges')
+    parser.add_argument('--c-prob', type=float, default=RUN_VARS['c_prob'],
+                        help='probability of each cell to begin alive')
+    parser.add_argument('--glider-count', type=int, choices=(1, 2), default=RUN_VARS['glider_count'],
+                        help="run one or two Gosper's glider guns instead of a random board")
+    parser.add_argument('--pattern', default=RUN_VARS['pattern'],
+                        help='start from a .rle, .cells or .csv pattern file instead of a random board')
+    parser.add_argument('--seed', type=int, default=RUN_VARS['seed'], help='seed for the random board')
+    parser.add_argument('--generations', type=int, default=RUN_VARS['generations'],
+                        help='number of generations to run')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=RUN_VARS['engine'],
+                        help='stepping engine')
+    parser.add_argument('--rule', default=RUN_VARS['rule'],
+                        help=f"rule name ({', '.join(RULES)}) or B/S rulestring such as B36/S23, "
+                             "by default the rule an .rle pattern names, else Conway")
+    parser.add_argument('--cycles', action=argparse.BooleanOptionalAction, default=RUN_VARS['detect_cycles'],
+                        help='detect still lifes and short cycles')
+    parser.add_argument('--stop-on-cycle', action='store_true', default=RUN_VARS['stop_on_cycle'],
+                        help='end the run once a cycle is confirmed')
+    parser.add_argument('--resume', metavar='CHECKPOINT', default=RUN_VARS['resume'],
+                        help='continue from a checkpoint (its wrap, rule and seed replace the options)')
+    parser.add_argument('--checkpoint', default=RUN_VARS['checkpoint'],
+                        help='write a checkpoint (CHECKPOINT.npy and CHECKPOINT.json) at the end of the run')
+    parser.add_argument('--checkpoint-every', type=int, default=RUN_VARS['checkpoint_every'],
+                        help='also write the checkpoint every this many generations')
+    parser.add_argument('--record', metavar='REPLAY', default=RUN_VARS['record'],
+                        help='stream every generation to a replay file')
+    parser.add_argument('--out', default=RUN_VARS['out_dir'],
+                        help='directory for final_board.npy and stats.csv')
+    args = parser.parse_args(argv)
+
+    run_vars = dict(RUN_VARS)
+    run_vars.update({
+        'wrap': args.wrap,
+        'glider_count': args.glider_count,
+        'pattern': args.pattern,
+        's_size': args.size,
+        'c_prob': args.c_prob,
+        'seed': args.seed,
+        'generations': args.generations,
+        'engine': args.engine,
+        'rule': args.rule,
+        'detect_cycles': args.cycles,
+        'stop_on_cycle': args.stop_on_cycle,
+        'out_dir': args.out,
+        'resume': args.resume,
+        'checkpoint': args.checkpoint,
+        'checkpoint_every': args.checkpoint_every,
+        'record': args.record,
+    })
+    return run_vars
+
+def main(argv=None):
+    """Setup, Run, Report"""
+    run_vars = parse_args(argv)
+    try:
+        cells, stats, elapsed, cycle = run_simulation(run_vars)
+    except (MemoryError, ValueError, OSError) as err:
+        raise SystemExit(f"Refusing to run: {err}")
+    board_path, stats_path = write_results(run_vars['out_dir'], cells, stats)
+
+    gens = len(stats) - 1
+    rate = gens / elapsed if elapsed > 0 else float('inf')
+    print(f"Final board written to {board_path}")
+    print(f"Statistics written to {stats_path}")
+    if run_vars['checkpoint']:
+        print(f"Checkpoint of generation {int(stats[-1, 0])} written to {run_vars['checkpoint']}")
+    if run_vars['record']:
+        print(f"Replay of {len(stats)} generations written to {run_vars['record']}")
+    print(f"Ran {gens} generations of {rule_name(run_vars['rule'])} in {elapsed:.3f}s ({rate:.1f} generations/s), "
+          f"final population {int(stats[-1, 1])}")
+    if run_vars['detect_cycles']:
+        print(f"Cycle: {describe_cycle(cycle)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Bounded, delta-compressed board history for the Game of Life
+# ---------------------------------------------------------------------------
+# Every generation is bit-packed (8 cells per byte). Every keyframe_interval
+# generations the whole packed board is stored as a keyframe; in between
+# only the XOR with the previous generation is stored, as the positions and
+# values of its nonzero bytes, so a settled board costs a few bytes per
+# generation instead of a full copy.
+#
+# Frames are kept in groups (one keyframe plus the deltas that follow it).
+# Once the stored bytes exceed max_bytes the oldest groups are dropped, so
+# the buffer works as a ring with a memory cap. Appending is O(1) (besides
+# packing the board) and any stored generation is rebuilt from its keyframe
+# with at most keyframe_interval - 1 delta applications.
+# ---------------------------------------------------------------------------
+
+from collections import deque
+
+import numpy as np
+
+HISTORY_BYTES = 64 * 2 ** 20    # Default memory cap, 64 MiB
+KEYFRAME_INTERVAL = 32          # Generations per keyframe
+
+
+class HistoryBuffer:
+    """Ring buffer of board generations stored as packed keyframes plus XOR deltas."""
+
+    def __init__(self, shape, max_bytes=HISTORY_BYTES, keyframe_interval=KEYFRAME_INTERVAL):
+        self.shape = tuple(shape)
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.clear()
+
+    def clear(self):
+        """Drop every stored generation."""
+        self.groups = deque()   # [first generation, keyframe, [(positions, values), ...], bytes]
+        self.nbytes = 0
+        self.last = None        # Packed board of the newest generation
+
+    def __len__(self):
+        return 0 if not self.groups else self.newest - self.oldest + 1
+
+    def __contains__(self, gen):
+        return bool(self.groups) and self.oldest <= gen <= self.newest
+
+    @property
+    def oldest(self):
+        """First generation still stored."""
+        return self.groups[0][0]
+
+    @property
+    def newest(self):
+        """Last generation stored."""
+        return self.groups[-1][0] + len(self.groups[-1][2])
+
+    def append(self, gen, cells):
+        """Store the board of generation gen, which must follow the newest one."""
+        if self.groups and gen != self.newest + 1:
+            raise ValueError(f"Generation {gen} does not follow the newest stored generation {self.newest}")
+        packed = np.packbits(cells, axis=None)
+
+        group = self.groups[-1] if self.groups else None
+        if group is None or len(group[2]) + 1 >= self.keyframe_interval:
+            group = [gen, packed, [], packed.nbytes]
+            self.groups.append(group)
+            self.nbytes += packed.nbytes
+        else:
+            # Only the bytes that changed since the previous generation
+            positions = np.flatnonzero(packed != self.last).astype(np.int32)
+            values = packed[positions] ^ self.last[positions]
+            group[2].append((positions, values))
+            size = positions.nbytes + values.nbytes
+            group[3] += size
+            self.nbytes += size
+        self.last = packed
+
+        # Drop the oldest groups past the memory cap, always keeping the newest one
+        while self.nbytes > self.max_bytes and len(self.groups) > 1:
+            self.nbytes -= self.groups.popleft()[3]
+
+    def _group(self, gen):
+        """Return the group holding gen; all groups but the newest are full."""
+        if gen not in self:
+            raise KeyError(f"Generation {gen} is not stored (have {self.oldest}..{self.newest})"
+                           if self.groups else f"Generation {gen} is not stored (history is empty)")
+        return self.groups[(gen - self.oldest) // self.keyframe_interval]
+
+    def _packed(self, gen):
+        """Rebuild the packed board of a stored generation."""
+        first, keyframe, deltas, _ = self._group(gen)
+        packed = keyframe.copy()
+        for positions, values in deltas[:gen - first]:
+            packed[positions] ^= values
+        return packed
+
+    def get(self, gen):
+        """Rebuild the board of a stored generation as a uint8 array."""
+        size = self.shape[0] * self.shape[1]
+        return np.unpackbits(self._packed(gen), count=size).reshape(self.shape)
+
+    def truncate(self, gen):
+        """Forget every generation after gen, so stepping can continue from it."""
+        group = self._group(gen)
+        packed = self._packed(gen)
+        while self.groups[-1] is not group:
+            self.nbytes -= self.groups.pop()[3]
+        first, _, deltas, _ = group
+        for positions, values in deltas[gen - first:]:
+            size = positions.nbytes + values.nbytes
+            group[3] -= size
+            self.nbytes -= size
+        del deltas[gen - first:]
+        self.last = packed
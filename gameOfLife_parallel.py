@@ -0,0 +1,197 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Multi-process stepping for Conway's Game of Life
+# ---------------------------------------------------------------------------
+# Splits the board into horizontal bands, one per worker process. Both
+# generations of the board live in multiprocessing.shared_memory, so every
+# worker steps its own band in place and the only data it reads from other
+# bands is the one-row halo directly above and below it (the first and last
+# bands exchange halos across the toroidal wrap). Neighbors are summed over
+# slices of the shared board, halos included, into buffers each worker
+# allocates once, so a step never copies its band. A barrier separates
+# generations so no worker reads a halo before its neighbor has written it.
+#
+# Example, printing the scaling efficiency at 1, 2, 4 and 8 workers:
+#   python gameOfLife_parallel.py --size 2000 --generations 50
+# ---------------------------------------------------------------------------
+
+import argparse
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def band_limits(dimy, workers):
+    """Split dimy rows into contiguous (y0, y1) bands, one per worker."""
+    edges = np.linspace(0, dimy, workers + 1).astype(int)
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(workers)]
+
+def _step_band(cur, nxt, y0, y1, wrap, scratch):
+    """Step rows y0:y1 of cur into nxt, reading the halo rows straight from cur.
+
+    scratch holds the worker's (y1 - y0, dimx) column sum, count and next
+    state buffers, so no step allocates or copies the band.
+    """
+    dimy = cur.shape[0]
+    vsum, count, new = scratch
+    band = cur[y0:y1]
+    alive = band.view(bool)     # Cells are 0 or 1
+
+    # Each cell plus the cells above and below it, the halo rows read in place
+    np.add(band[1:], band[:-1], out=vsum[1:])
+    vsum[0] = band[0]
+    vsum[:-1] += band[1:]
+    if y0 > 0 or wrap:
+        vsum[0] += cur[(y0 - 1) % dimy]
+    if y1 < dimy or wrap:
+        vsum[-1] += cur[y1 % dimy]
+
+    # The same across columns, so count is the 3x3 total including the cell itself
+    np.add(vsum[:, 1:], vsum[:, :-1], out=count[:, 1:])
+    count[:, 0] = vsum[:, 0]
+    count[:, :-1] += vsum[:, 1:]
+    if wrap:
+        count[:, 0] += vsum[:, -1]
+        count[:, -1] += vsum[:, 0]
+
+    # Alive next with a total of 3, or 4 when alive now
+    np.equal(count, 3, out=new)
+    keep = count.view(bool)
+    np.equal(count, 4, out=keep)
+    np.logical_and(keep, alive, out=keep)
+    np.logical_or(new, keep, out=new)
+
+    changed = vsum.view(bool)   # The column sums are no longer needed
+    births = int(np.count_nonzero(np.greater(new, alive, out=changed)))
+    deaths = int(np.count_nonzero(np.less(new, alive, out=changed)))
+    np.copyto(nxt[y0:y1], new)
+    return births, deaths
+
+def _worker(shm_name, shape, wrap, y0, y1, barrier, conn):
+    """Worker process: step one band for as many generations as requested."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    boards = np.ndarray((2,) + shape, dtype=np.uint8, buffer=shm.buf)
+    band = (y1 - y0, shape[1])
+    scratch = (np.zeros(band, dtype=np.uint8), np.zeros(band, dtype=np.uint8), np.zeros(band, dtype=bool))
+
+    while True:
+        command = conn.recv()
+        if command is None:
+            break
+        parity, generations = command
+        counts = []
+        for _ in range(generations):
+            counts.append(_step_band(boards[parity], boards[1 - parity], y0, y1, wrap, scratch))
+            # Everyone must finish writing before the next generation reads halos
+            barrier.wait()
+            parity = 1 - parity
+        conn.send(counts)
+
+    del boards
+    shm.close()
+
+class ParallelEngine:
+    """Step a board in horizontal bands across a pool of worker processes."""
+
+    def __init__(self, cells, wrap, workers=DEFAULT_WORKERS):
+        dimy, dimx = cells.shape
+        self.shape = (dimy, dimx)
+        self.wrap = wrap
+        self.parity = 0
+        workers = max(1, min(workers, dimy))
+
+        self.shm = shared_memory.SharedMemory(create=True, size=2 * dimy * dimx)
+        self.boards = np.ndarray((2, dimy, dimx), dtype=np.uint8, buffer=self.shm.buf)
+        self.boards[0] = cells != 0
+
+        barrier = mp.Barrier(workers)
+        self.conns = []
+        self.procs = []
+        for y0, y1 in band_limits(dimy, workers):
+            parent, child = mp.Pipe()
+            proc = mp.Process(target=_worker, daemon=True,
+                              args=(self.shm.name, self.shape, wrap, y0, y1, barrier, child))
+            proc.start()
+            self.conns.append(parent)
+            self.procs.append(proc)
+
+    def run(self, generations):
+        """Advance several generations and return their (births, deaths) counts."""
+        for conn in self.conns:
+            conn.send((self.parity, generations))
+        per_band = [conn.recv() for conn in self.conns]
+        self.parity = (self.parity + generations) % 2
+        return [tuple(map(sum, zip(*gen))) for gen in zip(*per_band)]
+
+    def step(self):
+        """Advance one generation and return the (births, deaths) counts."""
+        return self.run(1)[0]
+
+    def population(self):
+        """Count the living cells."""
+        return int(np.count_nonzero(self.boards[self.parity]))
+
+    def get_cells(self):
+        """Return a copy of the board as a dense array."""
+        return self.boards[self.parity].copy()
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self.shm is None:
+            return
+        for conn in self.conns:
+            conn.send(None)
+        for proc in self.procs:
+            proc.join()
+        del self.boards
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+def scaling_report(size=2000, generations=50, workers=(1, 2, 4, 8), wrap=True, c_prob=0.25, seed=0):
+    """Time the parallel engine at several worker counts and print the scaling efficiency."""
+    from gameOfLife_bitpacked import run as run_bitpacked
+
+    cells = (np.random.default_rng(seed).random((size, size)) < c_prob).astype(np.uint8)
+    expected = run_bitpacked(cells, generations, wrap)
+
+    print(f"{size}x{size} board, {generations} generations, wrap={wrap}")
+    print(f"{'workers':>8} {'seconds':>9} {'gen/s':>9} {'speedup':>8} {'efficiency':>11}")
+    base = None
+    results = []
+    for count in workers:
+        engine = ParallelEngine(cells, wrap, count)
+        try:
+            start = time.perf_counter()
+            engine.run(generations)
+            elapsed = time.perf_counter() - start
+            if not np.array_equal(engine.get_cells(), expected):
+                raise RuntimeError(f"Parallel result with {count} workers does not match the single-process engine")
+        finally:
+            engine.close()
+
+        base = elapsed if base is None else base
+        speedup = base / elapsed
+        efficiency = speedup * workers[0] / count
+        results.append((count, elapsed, speedup, efficiency))
+        print(f"{count:>8} {elapsed:>9.3f} {generations / elapsed:>9.1f} {speedup:>8.2f} {efficiency:>10.0%}")
+    return results
+
+def main(argv=None):
+    """Run the scaling report from the command line."""
+    parser = argparse.ArgumentParser(description='Report multi-process scaling efficiency.')
+    parser.add_argument('--size', type=int, default=2000, help='world size (square)')
+    parser.add_argument('--generations', type=int, default=50, help='generations per timing')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='worker counts to time')
+    parser.add_argument('--wrap', action=argparse.BooleanOptionalAction, default=True,
+                        help='wrap cells around the edges')
+    args = parser.parse_args(argv)
+    scaling_report(args.size, args.generations, tuple(args.workers), args.wrap)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Pattern files for the Game of Life: RLE, plaintext .cells and CSV
+# ---------------------------------------------------------------------------
+# Loads and saves patterns as uint8 boards (1 = alive):
+#   .rle    the standard Life run-length format (x = .., y = .., rule = ..)
+#   .cells  plaintext, '.' dead and 'O' alive, '!' comment lines
+#   .csv    the dense 0/1 grids of glider.csv and gliders.csv
+#
+# RLE bodies are parsed without a per-cell loop: the runs are tokenized once
+# and expanded into cell coordinates with cumulative sums and np.repeat. The
+# rule an RLE header names is read separately by pattern_rule.
+#
+# Parsed patterns are cached twice: in memory for the life of the process
+# (keyed by path, size and modification time) and on disk as a bit-packed
+# .npz in PATTERN_CACHE_DIR, keyed by the SHA-1 of the file contents, so a
+# pattern is only ever parsed once per machine.
+# ---------------------------------------------------------------------------
+
+import hashlib
+import os
+import re
+
+import numpy as np
+
+from gameOfLife_rules import CONWAY, rule_name
+
+PATTERN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pattern_cache')
+RLE_LINE_LENGTH = 70    # Longest line written to .rle files
+
+_MEMORY_CACHE = {}      # (path, size, mtime) -> read-only pattern
+_RLE_HEADER = re.compile(r'x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?', re.IGNORECASE)
+
+# np.strings is NumPy 2 only, np.char has the same functions on older versions
+_strings = np.strings if hasattr(np, 'strings') else np.char
+
+
+def _rle_tokens(body):
+    """Split an RLE body (as ASCII bytes) into its tag bytes and run counts."""
+    digit = (body >= ord('0')) & (body <= ord('9'))
+    tag_at = np.flatnonzero(~digit)
+
+    # Each digit belongs to the tag after it, worth 10**(digits left before that tag)
+    digit_at = np.flatnonzero(digit)
+    owner = np.searchsorted(tag_at, digit_at)
+    if len(owner) and owner[-1] == len(tag_at):
+        raise ValueError("RLE pattern ends with a run count but no tag")
+    values = (body[digit_at] - ord('0')) * 10.0 ** (tag_at[owner] - digit_at - 1)
+    counts = np.bincount(owner, weights=values, minlength=len(tag_at)).astype(np.int64)
+
+    # A tag without a count is a run of one
+    counts[np.bincount(owner, minlength=len(tag_at)) == 0] = 1
+    return body[tag_at], counts
+
+def parse_rle(text):
+    """Parse RLE text into a uint8 pattern."""
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not line.startswith('#')]
+    header = _RLE_HEADER.match(lines[0]) if lines else None
+    if header is None:
+        raise ValueError("RLE pattern is missing its 'x = .., y = ..' header line")
+    width, height = int(header.group(1)), int(header.group(2))
+
+    body = np.frombuffer(''.join(lines[1:]).split('!')[0].encode('ascii'), dtype=np.uint8)
+    body = body[~np.isin(body, np.frombuffer(b' \t\r', dtype=np.uint8))]
+    tags, counts = _rle_tokens(body)
+
+    # Row of every token: a '$' run ends that many rows
+    newline = tags == ord('$')
+    row = np.cumsum(np.where(newline, counts, 0)) - np.where(newline, counts, 0)
+
+    # Column where every token starts: cells run so far, minus those run before the last '$'
+    runs = np.where(newline, 0, counts)
+    before = np.cumsum(runs) - runs
+    col = before - np.maximum.accumulate(np.where(newline, np.cumsum(runs), 0))
+
+    # Expand the alive runs ('b' is dead, any other letter is alive) into cells
+    alive = ~newline & (tags != ord('b')) & (tags != ord('B'))
+    lengths = counts[alive]
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    ys = np.repeat(row[alive], lengths)
+    xs = np.repeat(col[alive], lengths) + offsets
+
+    height = max(height, int(ys.max()) + 1 if len(ys) else 0)
+    width = max(width, int(xs.max()) + 1 if len(xs) else 0)
+    cells = np.zeros((height, width), dtype=np.uint8)
+    cells[ys, xs] = 1
+    return cells
+
+def parse_rle_rule(text):
+    """Return the rule named in an RLE header as a B/S rulestring, or None when it names none."""
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not line.startswith('#')]
+    header = _RLE_HEADER.match(lines[0]) if lines else None
+    if header is None or header.group(3) is None:
+        return None
+    rule = header.group(3).split(':')[0]    # Drop a bounded-grid suffix such as ':T100,100'
+    if not rule.upper().startswith('B'):
+        # The older survival/birth notation, e.g. 23/3
+        survive, _, birth = rule.upper().replace('S', '').partition('/')
+        rule = f"B{birth.replace('B', '')}/S{survive}"
+    return rule_name(rule)
+
+def pattern_rule(path):
+    """Return the rule a pattern file names as a B/S rulestring, or None (only .rle files name one)."""
+    if os.path.splitext(path)[1].lower() != '.rle':
+        return None
+    with open(path, 'rb') as f:
+        head = f.read(4096)     # Comment lines and the header come first
+    return parse_rle_rule(head.decode('utf-8', errors='replace'))
+
+def parse_cells(text):
+    """Parse plaintext .cells text into a uint8 pattern."""
+    lines = [line.rstrip() for line in text.splitlines() if not line.startswith('!')]
+    width = max((len(line) for line in lines), default=0)
+    grid = np.frombuffer(''.join(line.ljust(width, '.') for line in lines).encode('ascii'), dtype=np.uint8)
+    alive = (grid == ord('O')) | (grid == ord('*'))
+    return alive.reshape(len(lines), width).astype(np.uint8)
+
+def parse_csv(text):
+    """Parse a dense comma separated 0/1 grid into a uint8 pattern."""
+    rows = [line for line in text.splitlines() if line.strip()]
+    return np.array([row.split(',') for row in rows], dtype=np.uint8)
+
+PARSERS = {
+    '.rle': parse_rle,
+    '.cells': parse_cells,
+    '.csv': parse_csv,
+}
+
+def _read_cached(data):
+    """Return the pattern stored in the disk cache for this file content, or None."""
+    path = os.path.join(PATTERN_CACHE_DIR, hashlib.sha1(data).hexdigest() + '.npz')
+    try:
+        with np.load(path) as cached:
+            shape = tuple(cached['shape'])
+            return np.unpackbits(cached['packed'], count=shape[0] * shape[1]).reshape(shape), path
+    except (OSError, KeyError, ValueError):
+        return None, path
+
+def load_pattern(path):
+    """Load a .rle, .cells or .csv pattern as a read-only uint8 array, using the caches."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in PARSERS:
+        raise ValueError(f"Unknown pattern format '{ext}', expected one of: {', '.join(PARSERS)}")
+
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    cells = _MEMORY_CACHE.get(key)
+    if cells is not None:
+        return cells
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    cells, cache_path = _read_cached(data)
+    if cells is None:
+        cells = PARSERS[ext](data.decode('utf-8'))
+        try:
+            os.makedirs(PATTERN_CACHE_DIR, exist_ok=True)
+            np.savez(cache_path, packed=np.packbits(cells, axis=None), shape=np.array(cells.shape))
+        except OSError:
+            pass    # The disk cache is only an optimization
+
+    cells.flags.writeable = False
+    _MEMORY_CACHE[key] = cells
+    return cells
+
+def _run_counts(lengths):
+    """Format RLE run counts, leaving out the implicit count of one."""
+    top = int(lengths.max()) if len(lengths) else 1
+    table = np.array(['', ''] + [str(n) for n in range(2, top + 1)])
+    return table[lengths]
+
+def format_rle(cells, name=None, rule=CONWAY):
+    """Format a board as RLE text."""
+    dimy, dimx = cells.shape
+    rows = np.flatnonzero(np.any(cells, axis=1))
+    board = np.asarray(cells)[rows] != 0
+
+    # Runs start at column 0 and wherever the state changes, up to the last alive cell of the row
+    stop = dimx - np.argmax(board[:, ::-1], axis=1) if len(rows) else np.zeros(0, dtype=np.intp)
+    starts = np.ones(board.shape, dtype=bool)
+    starts[:, 1:] = board[:, 1:] != board[:, :-1]
+    starts &= np.arange(dimx) < stop[:, None]
+    r, c = np.nonzero(starts)
+    following = np.zeros_like(c)
+    following[:-1] = np.where(r[1:] == r[:-1], c[1:], stop[r[:-1]])
+    following[-1:] = stop[r[-1:]]
+    lengths = following - c
+
+    # The first run of each row is preceded by the '$' ending the rows since the previous one
+    prefix = np.zeros(len(r), dtype='<U24')
+    first = np.flatnonzero(np.diff(r, prepend=-1) != 0)
+    gaps = np.diff(rows, prepend=0)
+    prefix[first] = np.where(gaps > 0, _strings.add(_run_counts(gaps), '$'), '')
+    tokens = _strings.add(prefix, _strings.add(_run_counts(lengths), np.where(board[r, c], 'o', 'b')))
+    tokens = np.append(tokens, '!')
+
+    # Wrap lines without splitting tokens; the margin keeps every line within RLE_LINE_LENGTH
+    ends = np.cumsum(_strings.str_len(tokens))
+    width = RLE_LINE_LENGTH - int(_strings.str_len(tokens).max()) + 1
+    line = (ends - 1) // max(width, 1)
+    breaks = np.flatnonzero(np.diff(line) > 0) + 1
+    tokens[breaks] = _strings.add('\n', tokens[breaks])
+
+    header = [f"#N {name}"] if name else []
+    header.append(f"x = {dimx}, y = {dimy}, rule = {rule_name(rule)}")
+    return '\n'.join(header) + '\n' + ''.join(tokens.tolist()) + '\n'
+
+def format_cells(cells, name=None):
+    """Format a board as plaintext .cells text."""
+    header = [f"!Name: {name}"] if name else []
+    rows = np.where(np.asarray(cells) != 0, ord('O'), ord('.')).astype(np.uint8)
+    lines = [bytes(row).decode('ascii') for row in rows]
+    return '\n'.join(header + lines) + '\n'
+
+def save_pattern(path, cells, name=None, rule=CONWAY):
+    """Save a board as a .rle or .cells pattern file."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.rle':
+        text = format_rle(cells, name, rule)
+    elif ext == '.cells':
+        text = format_cells(cells, name)
+    else:
+        raise ValueError(f"Cannot save patterns as '{ext}', expected .rle or .cells")
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
@@ -0,0 +1,74 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Per-phase frame timing for the Game of Life front-ends
+# ---------------------------------------------------------------------------
+# PhaseTimer splits every frame into named phases (stepping, drawing, text,
+# waiting for the clock, flipping the display) and keeps the last `window`
+# frames of each in a fixed NumPy ring, so the overlay can show rolling
+# averages and p99 latencies without allocating per frame.
+#
+# The timer stays in the game loop permanently; while it is disabled every
+# call returns before reading the clock, so a hidden overlay costs a few
+# attribute lookups per frame.
+# ---------------------------------------------------------------------------
+
+import time
+
+import numpy as np
+
+PERF_WINDOW = 120   # Frames kept for the rolling statistics
+
+
+class PhaseTimer:
+    """Rolling per-phase frame timings that cost next to nothing while disabled."""
+
+    def __init__(self, phases, window=PERF_WINDOW):
+        self.phases = tuple(phases)
+        self.index = {phase: i for i, phase in enumerate(self.phases)}
+        self.window = window
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        """Forget every timed frame."""
+        self.samples = np.zeros((len(self.phases), self.window))
+        self.current = np.zeros(len(self.phases))
+        self.count = 0
+        self.last = None
+
+    def toggle(self):
+        """Switch timing on or off, starting the statistics afresh."""
+        self.enabled = not self.enabled
+        self.reset()
+        return self.enabled
+
+    def start(self):
+        """Start timing a frame."""
+        if self.enabled:
+            self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the last start or lap to phase."""
+        if not self.enabled or self.last is None:
+            return
+        now = time.perf_counter()
+        self.current[self.index[phase]] += now - self.last
+        self.last = now
+
+    def end(self):
+        """Finish the frame and store its phase timings in the ring."""
+        if not self.enabled or self.last is None:
+            return
+        self.samples[:, self.count % self.window] = self.current
+        self.current[:] = 0
+        self.count += 1
+
+    def stats(self):
+        """Return {phase: (mean ms, p99 ms)} over the frames in the window."""
+        frames = min(self.count, self.window)
+        if frames == 0:
+            return {phase: (0.0, 0.0) for phase in self.phases}
+        window = self.samples[:, :frames] * 1000
+        means = window.mean(axis=1)
+        p99 = np.percentile(window, 99, axis=1)
+        return dict(zip(self.phases, zip(means.tolist(), p99.tolist())))
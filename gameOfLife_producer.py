@@ -0,0 +1,233 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Simulation producer thread for the Game of Life
+# ---------------------------------------------------------------------------
+# SimulationThread steps the board on a worker thread at a target number of
+# generations per second, independent of how often the screen is redrawn.
+# It steps through any engine of gameOfLife_engine.ENGINES. Every generation
+# it publishes the engine's dense board (copied for engines that step in
+# place, so a published board is never written to again), feeds the cycle
+# detector and the replay recorder, keeps the population up to date from
+# the births and deaths, and marks the CHANGE_TILE square tiles they fall in
+# on a changed-tile map. Engines reporting only counts mark the tiles from
+# their own changed_tiles(), or every tile when they have none.
+#
+# The renderer calls frame() at its own rate and gets the latest board when
+# one was published since its previous call, skipping the generations in
+# between, along with the tiles changed meanwhile. It works out what changed
+# in view itself (see gameOfLife_render) and only uses the map to tell which
+# of its cached zoomed-out reductions are stale, so the cost of a frame does
+# not grow with the board.
+#
+# Boards replaced from outside (a HashLife jump) get a new engine and bump an
+# epoch number, so a generation computed from the old board while the jump ran
+# is discarded. The worker closes the engines it no longer steps.
+#
+# Hashing a generation for the cycle detector and handing it to the recorder
+# take time that grows with the board, so they run under their own lock and
+# only the swap of the published board holds the lock frame() and snapshot()
+# wait on. pause() returns once the step in flight is published.
+# ---------------------------------------------------------------------------
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from gameOfLife_cycles import CycleDetector, state_hash
+from gameOfLife_engine import make_engine
+from gameOfLife_rules import CONWAY
+
+RATE_WINDOW = 64        # Generations the measured rate is averaged over
+MAX_LAG = 0.25          # Seconds the producer may fall behind schedule before it stops catching up
+IDLE_WAIT = 0.1         # Seconds to wait between checks while paused or settled
+CHANGE_TILE = 64        # Cells per side of the tiles on the changed-tile map
+COPIED_ENGINES = ('buffered', 'tiled')  # Their get_cells() is a buffer the next step writes to
+
+
+class SimulationThread:
+    """Step a board on a worker thread at a target rate, publishing every generation."""
+
+    def __init__(self, cells, gen, wrap, rule=CONWAY, rate=10, stop_on_cycle=False, engine='numpy'):
+        self.wrap = wrap
+        self.rule = rule
+        self.engine_name = engine
+        self.engine = make_engine(engine, cells, wrap, rule)
+        self.retired = []       # Engines replaced since the worker last read the engine
+        self.rate = rate
+        self.stop_on_cycle = stop_on_cycle
+        self.lock = threading.Lock()        # Guards the published board, held only briefly
+        self.history_lock = threading.Lock()  # Guards the cycle detector and recorder
+        self.wake = threading.Event()       # Set to cut a pacing or idle wait short
+        self.active = threading.Event()     # Set while stepping, cleared while paused
+        self.idle = threading.Event()       # Set while the worker is not stepping
+        self.stopped = False
+
+        self.cells, self.gen, self.epoch = cells, gen, 0
+        self.detector = CycleDetector()
+        self.cycle = self.detector.observe(gen, cells, self._state_key(self.engine))
+        self.recorder = None
+        self.population = int(np.count_nonzero(cells))
+        self.fresh = True       # A generation was published since the last frame()
+        self.changed = np.ones((-(-cells.shape[0] // CHANGE_TILE), -(-cells.shape[1] // CHANGE_TILE)), dtype=bool)
+        self.times = deque(maxlen=RATE_WINDOW)
+
+        self.thread = threading.Thread(target=self._run, name='simulation', daemon=True)
+
+    def start(self):
+        """Start stepping."""
+        self.active.set()
+        self.thread.start()
+        return self
+
+    def _state_key(self, engine):
+        """Hash the engine's own state for the cycle detector, None to hash the dense board."""
+        return state_hash(engine.state()) if hasattr(engine, 'state') else None
+
+    def _step(self, engine):
+        """Step the engine once, returning (cells, changes, (births, deaths) counts, changed tiles, key)."""
+        if hasattr(engine, 'step_cells'):
+            changes = engine.step_cells()
+            births, deaths = changes
+            counts = (len(births[0]), len(deaths[0]))
+            changed = np.zeros_like(self.changed)
+            changed[births[0] // CHANGE_TILE, births[1] // CHANGE_TILE] = True
+            changed[deaths[0] // CHANGE_TILE, deaths[1] // CHANGE_TILE] = True
+        else:
+            changes = None
+            counts = engine.step()
+            if hasattr(engine, 'changed_tiles'):
+                changed = engine.changed_tiles(CHANGE_TILE)
+            else:
+                changed = np.ones_like(self.changed)
+        cells = engine.get_cells()
+        if self.engine_name in COPIED_ENGINES:
+            cells = cells.copy()
+        return cells, changes, counts, changed, self._state_key(engine)
+
+    def _run(self):
+        """Worker thread: step, publish and pace to the target rate."""
+        last_step = time.perf_counter()     # When the previous generation was due
+        while not self.stopped:
+            self.idle.clear()
+            if not self.active.is_set() or (self.stop_on_cycle and self.cycle is not None):
+                self.idle.set()
+                self.wake.wait(IDLE_WAIT)
+                self.wake.clear()
+                last_step = time.perf_counter()
+                continue
+
+            # Pace to the target rate, a rate change wakes the wait and moves the due time
+            due = last_step + 1 / self.rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                self.wake.wait(delay)
+                self.wake.clear()
+                continue
+            last_step = max(due, time.perf_counter() - MAX_LAG)
+
+            with self.lock:
+                engine, gen, epoch = self.engine, self.gen, self.epoch
+                retired, self.retired = self.retired, []
+            for old in retired:
+                if hasattr(old, 'close'):
+                    old.close()
+            self._publish(gen + 1, *self._step(engine), epoch)
+        self.idle.set()
+
+    def _publish(self, gen, cells, changes, counts, changed, key, epoch):
+        """Make generation gen the latest one, unless the board was replaced meanwhile."""
+        with self.history_lock:
+            if epoch != self.epoch:
+                return
+            cycle = self.detector.observe(gen, cells, key)
+            if self.recorder is not None:
+                self.recorder.record(gen, cells, changes)
+            with self.lock:
+                self.cells, self.gen, self.cycle, self.fresh = cells, gen, cycle, True
+                self.population += counts[0] - counts[1]
+                self.changed |= changed
+                self.times.append(time.perf_counter())
+
+    def frame(self, always=False):
+        """Return the latest (cells, gen, cycle, changed), or None if nothing was published since the last call.
+
+        changed is the map of tiles changed since the last call. With always
+        the latest generation is returned even if it was already.
+        """
+        with self.lock:
+            if not (self.fresh or always):
+                return None
+            changed, self.changed = self.changed, np.zeros_like(self.changed)
+            self.fresh = False
+            return self.cells, self.gen, self.cycle, changed
+
+    def snapshot(self):
+        """Return the latest (cells, gen, cycle)."""
+        with self.lock:
+            return self.cells, self.gen, self.cycle
+
+    def replace(self, cells, gen):
+        """Replace the board (e.g. after a jump) with a new engine, discarding any generation in flight."""
+        engine = make_engine(self.engine_name, cells, self.wrap, self.rule)
+        with self.history_lock:
+            self.detector.reset()
+            cycle = self.detector.observe(gen, cells, self._state_key(engine))
+            if self.recorder is not None:
+                self.recorder.record(gen, cells)
+            population = int(np.count_nonzero(cells))
+            with self.lock:
+                self.epoch += 1     # Written under both locks, so either one gives a consistent read
+                self.retired.append(self.engine)
+                self.engine = engine
+                self.cells, self.gen, self.cycle, self.fresh = cells, gen, cycle, True
+                self.population = population
+                self.changed[:] = True
+                self.times.clear()
+
+    def start_recording(self, open_recorder):
+        """Attach the recorder open_recorder(cells, gen) returns, from the latest generation on."""
+        with self.history_lock:
+            self.recorder = open_recorder(self.cells, self.gen)
+
+    def stop_recording(self):
+        """Detach and return the recorder, the caller closes it."""
+        with self.history_lock:
+            recorder, self.recorder = self.recorder, None
+        return recorder
+
+    def set_rate(self, rate):
+        """Change the target generations per second."""
+        self.rate = max(rate, 1)
+        self.wake.set()
+
+    def measured_rate(self):
+        """Generations per second actually published recently."""
+        times = list(self.times)
+        if len(times) < 2 or time.perf_counter() - times[-1] > 1:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def pause(self):
+        """Stop stepping until resume(), waiting for the step in flight to be published."""
+        self.active.clear()
+        self.wake.set()
+        if self.thread.is_alive() and threading.current_thread() is not self.thread:
+            self.idle.wait()
+
+    def resume(self):
+        """Continue stepping."""
+        self.active.set()
+        self.wake.set()
+
+    def stop(self):
+        """Stop the worker thread and wait for it, then close the engine."""
+        self.stopped = True
+        self.wake.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        for engine in self.retired + [self.engine]:
+            if hasattr(engine, 'close'):
+                engine.close()
+        self.retired = []
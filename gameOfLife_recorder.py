@@ -0,0 +1,311 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Streaming replay recorder and reader for the Game of Life
+# ---------------------------------------------------------------------------
+# Recorder streams generations to a replay file from a background writer
+# thread. The stepping thread only hands over either the births and deaths
+# it already has (a few index arrays) or a copy of the board; packing,
+# diffing and zlib compression all happen on the writer thread. The queue
+# between them is bounded by the bytes it holds (QUEUE_BYTES), so a slow disk
+# slows the run down instead of letting memory grow, however large the board.
+#
+# Replay file format (all integers little-endian):
+#
+#   magic          8 bytes   b'GOLREC1\n'
+#   header length  uint32
+#   header         JSON: dimy, dimx, wrap, rule, seed, keyframe_interval
+#   records        one per recorded generation:
+#       kind       uint8     1 = keyframe, 2 = delta
+#       generation int64
+#       length     uint32    length of the payload
+#       payload    zlib compressed
+#           keyframe: the board, np.packbits of the flattened (dimy, dimx) cells
+#           delta:    uint32 birth count, uint32 death count, then the flat
+#                     indices (y * dimx + x) of the births and of the deaths,
+#                     each list sorted and stored as uint32 gaps from the
+#                     previous index (the first one from 0)
+#   index          int64 generations[n], int64 offsets[n], uint8 kinds[n]
+#   footer         uint64 index offset, uint64 n, magic b'GOLRIDX\n'
+#
+# A delta turns the board of the previous record into the board of its own
+# generation, so records need not be consecutive generations (e.g. after a
+# HashLife jump). A keyframe is written every keyframe_interval records.
+# Files without an index (a run that crashed) are indexed by scanning the
+# records when they are opened.
+#
+# Replay plays a file back without re-simulating: it keeps only the board of
+# the last frame rebuilt, and seeking to any record starts from the nearest
+# keyframe (or from that board when it is closer), so a seek never applies
+# more than keyframe_interval - 1 deltas.
+# ---------------------------------------------------------------------------
+
+import json
+import os
+import queue
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from gameOfLife_rules import CONWAY
+
+MAGIC = b'GOLREC1\n'
+INDEX_MAGIC = b'GOLRIDX\n'
+KEYFRAME, DELTA = 1, 2
+RECORD_HEADER = struct.Struct('<BqI')
+FOOTER = struct.Struct('<QQ8s')
+KEYFRAME_INTERVAL = 64      # Records per keyframe
+QUEUE_BYTES = 256 * 2**20   # Bytes of boards and indices waiting for the writer before record() blocks
+COMPRESSION_LEVEL = 1       # zlib level, fast
+REPLAY_EXTENSION = '.golr'
+REPLAY_SPEEDS = (-256, -64, -16, -4, -1, 1, 4, 16, 64, 256, 1024)   # Records per frame, negative plays backward
+
+
+def _encode_indices(flat):
+    """Store sorted flat indices as uint32 gaps."""
+    return np.diff(np.asarray(flat, dtype=np.int64), prepend=0).astype(np.uint32).tobytes()
+
+def _decode_indices(data):
+    """Undo _encode_indices."""
+    return np.cumsum(np.frombuffer(data, dtype=np.uint32), dtype=np.int64)
+
+def _item_bytes(item):
+    """Bytes held by a queued (kind, gen, board or index arrays) item."""
+    data = item[2]
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    return sum(indices.nbytes for indices in data)
+
+def latest_recording(directory):
+    """Return the most recently written replay file in directory, or None."""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(REPLAY_EXTENSION)]
+    except OSError:
+        return None
+    paths = [os.path.join(directory, name) for name in names]
+    return max(paths, key=os.path.getmtime, default=None)
+
+class Recorder:
+    """Stream generations to a replay file from a background writer thread."""
+
+    def __init__(self, path, shape, wrap, rule=CONWAY, seed=None,
+                 keyframe_interval=KEYFRAME_INTERVAL, queue_bytes=QUEUE_BYTES):
+        self.path = path
+        self.shape = tuple(shape)
+        self.keyframe_interval = keyframe_interval
+        self.count = 0              # Records handed to the writer so far
+        self.last_gen = None
+        self.queue = queue.Queue()
+        self.queue_bytes = queue_bytes
+        self.queued = 0             # Bytes in the queue, one item is let through even if larger
+        self.drained = threading.Condition()
+        self.error = None
+
+        self.file = open(path, 'wb')
+        header = json.dumps({
+            'dimy': self.shape[0], 'dimx': self.shape[1], 'wrap': bool(wrap), 'rule': rule,
+            'seed': None if seed is None else int(seed), 'keyframe_interval': keyframe_interval,
+        }).encode('utf-8')
+        self.file.write(MAGIC + struct.pack('<I', len(header)) + header)
+        self.file.flush()   # A run that crashes still leaves a readable file
+
+        self.generations, self.offsets, self.kinds = [], [], []
+        self.thread = threading.Thread(target=self._write_loop, name='replay-writer', daemon=True)
+        self.thread.start()
+
+    def record(self, gen, cells, changes=None):
+        """Queue generation gen; changes are its (births, deaths) index tuples when known.
+
+        Without changes the board is copied and diffed on the writer thread.
+        """
+        if self.error is not None:
+            raise self.error
+        if self.last_gen is not None and gen <= self.last_gen:
+            raise ValueError(f"Generation {gen} does not follow the last recorded generation {self.last_gen}")
+
+        dimx = self.shape[1]
+        if self.count % self.keyframe_interval == 0:
+            item = (KEYFRAME, gen, np.array(cells, dtype=np.uint8))
+        elif changes is None:
+            item = (DELTA, gen, np.array(cells, dtype=np.uint8))
+        else:
+            (by, bx), (dy, dx) = changes
+            item = (DELTA, gen, (by * dimx + bx, dy * dimx + dx))
+        size = _item_bytes(item)
+        with self.drained:
+            while self.queued and self.queued + size > self.queue_bytes and self.error is None:
+                self.drained.wait()
+            self.queued += size
+        self.queue.put(item)
+        self.count += 1
+        self.last_gen = gen
+
+    def _write_loop(self):
+        """Writer thread: pack, diff, compress and write queued generations."""
+        board = None    # The board of the last record, kept by the writer
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                kind, gen, data = item
+                if kind == KEYFRAME:
+                    board = data
+                    payload = np.packbits(board, axis=None).tobytes()
+                else:
+                    if isinstance(data, np.ndarray):
+                        births = np.flatnonzero(data > board)
+                        deaths = np.flatnonzero(data < board)
+                        board = data
+                    else:
+                        births, deaths = np.sort(data[0]), np.sort(data[1])     # Engines may list them by tile
+                        board.flat[births] = 1
+                        board.flat[deaths] = 0
+                    payload = (struct.pack('<II', len(births), len(deaths)) +
+                               _encode_indices(births) + _encode_indices(deaths))
+                payload = zlib.compress(payload, COMPRESSION_LEVEL)
+                with self.drained:
+                    self.queued -= _item_bytes(item)
+                    self.drained.notify()
+
+                self.generations.append(gen)
+                self.offsets.append(self.file.tell())
+                self.kinds.append(kind)
+                self.file.write(RECORD_HEADER.pack(kind, gen, len(payload)))
+                self.file.write(payload)
+        except Exception as err:    # Reported to the stepping thread by record() and close()
+            with self.drained:
+                self.error = err
+                self.drained.notify()
+            while self.queue.get() is not None:
+                pass
+
+    def close(self):
+        """Flush the queue, write the index and close the file."""
+        if self.file is None:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        index_offset = self.file.tell()
+        self.file.write(np.asarray(self.generations, dtype=np.int64).tobytes())
+        self.file.write(np.asarray(self.offsets, dtype=np.int64).tobytes())
+        self.file.write(np.asarray(self.kinds, dtype=np.uint8).tobytes())
+        self.file.write(FOOTER.pack(index_offset, len(self.generations), INDEX_MAGIC))
+        self.file.close()
+        self.file = None
+        if self.error is not None:
+            raise self.error
+
+class Replay:
+    """Read a replay file and rebuild the board of any recorded generation."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Game of Life replay file")
+        (length,) = struct.unpack('<I', self.file.read(4))
+        self.header = json.loads(self.file.read(length))
+        self.shape = (self.header['dimy'], self.header['dimx'])
+        self.data_start = self.file.tell()
+        if not self._read_index():
+            self._scan_index()
+        self.keyframes = np.flatnonzero(self.kinds == KEYFRAME)
+        self._cache = None      # (record index, board) of the last board rebuilt
+
+    def _read_index(self):
+        """Load the index written by Recorder.close(), returning False if there is none."""
+        self.file.seek(0, 2)
+        end = self.file.tell()
+        if end - self.data_start < FOOTER.size:
+            return False
+        self.file.seek(end - FOOTER.size)
+        index_offset, n, magic = FOOTER.unpack(self.file.read(FOOTER.size))
+        if magic != INDEX_MAGIC:
+            return False
+        self.file.seek(index_offset)
+        self.generations = np.frombuffer(self.file.read(8 * n), dtype=np.int64)
+        self.offsets = np.frombuffer(self.file.read(8 * n), dtype=np.int64)
+        self.kinds = np.frombuffer(self.file.read(n), dtype=np.uint8)
+        return True
+
+    def _scan_index(self):
+        """Index an unfinished file by walking its records, stopping at a torn one."""
+        generations, offsets, kinds = [], [], []
+        self.file.seek(self.data_start)
+        while True:
+            offset = self.file.tell()
+            head = self.file.read(RECORD_HEADER.size)
+            if len(head) < RECORD_HEADER.size:
+                break
+            kind, gen, length = RECORD_HEADER.unpack(head)
+            if kind not in (KEYFRAME, DELTA) or len(self.file.read(length)) < length:
+                break
+            generations.append(gen)
+            offsets.append(offset)
+            kinds.append(kind)
+        self.generations = np.asarray(generations, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.kinds = np.asarray(kinds, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.generations)
+
+    def _payload(self, i):
+        """Read and decompress the payload of record i."""
+        self.file.seek(int(self.offsets[i]))
+        _, _, length = RECORD_HEADER.unpack(self.file.read(RECORD_HEADER.size))
+        return zlib.decompress(self.file.read(length))
+
+    def changes(self, i):
+        """Return the (births, deaths) flat cell indices of delta record i."""
+        if self.kinds[i] != DELTA:
+            raise ValueError(f"Record {i} is a keyframe, it has no births and deaths")
+        payload = self._payload(i)
+        n_births, n_deaths = struct.unpack('<II', payload[:8])
+        births = _decode_indices(payload[8:8 + 4 * n_births])
+        deaths = _decode_indices(payload[8 + 4 * n_births:8 + 4 * (n_births + n_deaths)])
+        return births, deaths
+
+    def frame(self, i):
+        """Rebuild the board of record i (the i-th recorded generation)."""
+        if not 0 <= i < len(self):
+            raise IndexError(f"Record {i} out of range, the replay has {len(self)}")
+
+        # Start from the nearest keyframe, or from the last board rebuilt if that is closer
+        key = int(self.keyframes[np.searchsorted(self.keyframes, i, side='right') - 1])
+        if self._cache is not None and key <= self._cache[0] <= i:
+            start, board = self._cache[0], self._cache[1].copy()
+        else:
+            size = self.shape[0] * self.shape[1]
+            board = np.unpackbits(np.frombuffer(self._payload(key), dtype=np.uint8), count=size)
+            start = key
+        for j in range(start + 1, i + 1):
+            births, deaths = self.changes(j)
+            board[births] = 1
+            board[deaths] = 0
+        self._cache = (i, board)
+        return board.reshape(self.shape).copy()
+
+    def seek_keyframe(self, i, direction):
+        """Return the keyframe before (direction < 0) or after record i, or the first or last record."""
+        if direction < 0:
+            k = np.searchsorted(self.keyframes, i, side='left') - 1
+            return int(self.keyframes[k]) if k >= 0 else 0
+        k = np.searchsorted(self.keyframes, i, side='right')
+        return int(self.keyframes[k]) if k < len(self.keyframes) else len(self) - 1
+
+    def index_of(self, gen):
+        """Return the record index of generation gen."""
+        i = int(np.searchsorted(self.generations, gen))
+        if i == len(self) or self.generations[i] != gen:
+            raise KeyError(f"Generation {gen} was not recorded")
+        return i
+
+    def get(self, gen):
+        """Rebuild the board of generation gen."""
+        return self.frame(self.index_of(gen))
+
+    def close(self):
+        """Close the replay file."""
+        self.file.close()
@@ -0,0 +1,289 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Viewport rendering for the Game of Life in pygame
+# ---------------------------------------------------------------------------
+# A Viewport is the part of the board shown in a fixed-size window: a zoom
+# level and the window's top left corner in board pixels. Zoomed in, a cell
+# is ZOOM_LEVELS pixels across; zoomed out past one pixel per cell, a pixel
+# stands for a block of LOD_LEVELS cells across. It is zoomed about a window
+# point (the mouse) and panned in pixels, and a board smaller than the window
+# is centred inside a border.
+#
+# BoardRenderer only ever touches the cells in view. Drawing a frame copies
+# one palette index per pixel-or-cell into a persistent 8-bit Surface with a
+# single pygame.surfarray.blit_array call, scales it by the cell size and
+# blits it into a window-sized copy of the picture, so a frame costs the same
+# for a 100x100 board as for a 20000x20000 one, and no Python code runs per
+# cell. Palette index 0 is dead, 1 alive, 2 the border, and the LOD_SHADES
+# indices after it blend from dead to alive.
+#
+# Zoomed out, each block of cells is reduced to the share of it alive (or,
+# in 'any' mode, whether any of it is) with a reshape-and-sum, shown as one
+# of the shades. Reductions are kept per tile of LOD_TILE pixels across for
+# the tiles in view, and only tiles the changed-tile map marks (see
+# gameOfLife_producer.CHANGE_TILE) or that just scrolled into view are
+# reduced again. At most MAX_LOD_CELLS cells are reduced per frame, taking
+# the tile rows in turn, so a busy zoomed-out view of a huge board keeps to
+# the frame budget; the tiles left over are shown as they were and reduced
+# on the next frames, and pending tells the caller to draw again meanwhile.
+#
+# The picture drawn last is kept, and only the window regions that differ
+# are pushed to the display: differing pixels-or-cells are binned into
+# DIRTY_TILE square tiles and each run of dirty tiles along a tile row
+# becomes one rectangle for pygame.display.update(rects). A busy view that
+# would need more than MAX_DIRTY_RECTS rectangles, or a view that was just
+# panned or zoomed, is updated whole.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+import pygame
+
+from gameOfLife_producer import CHANGE_TILE
+
+DIRTY_TILE = 16         # Cells per side of the tiles changed cells are merged into
+MAX_DIRTY_RECTS = 48    # Past this many rectangles the whole window is updated instead
+ZOOM_LEVELS = (1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 24, 32)    # Pixels per cell the zoom steps through
+LOD_LEVELS = (2, 4, 8, 16, 32)  # Cells per pixel the zoom steps through below one pixel per cell
+LOD_TILE = 64           # Pixels per side of the tiles reductions are kept for, a multiple of CHANGE_TILE
+LOD_SHADES = 8          # Shades between dead and alive for partly living blocks
+LOD_MODES = ('density', 'any')  # Show the share of a block alive, or whether any of it is
+MAX_LOD_CELLS = 1 << 24  # Cells reduced per frame at most when zoomed out, the rest wait for the next frames
+
+
+def block_counts(cells, block):
+    """Count the living cells in each block x block square of cells, padding the last ones with dead cells.
+
+    cells hold 0 and 1 (or bools) and block is at most 255.
+    """
+    pad = (-cells.shape[0] % block, -cells.shape[1] % block)
+    if pad != (0, 0):
+        cells = np.pad(cells, ((0, pad[0]), (0, pad[1])))
+
+    # Add up each block of rows with whole-row byte adds, then every block-th column
+    rows = cells.reshape(-1, block, cells.shape[1]).sum(axis=1, dtype=np.uint8)
+    counts = rows[:, 0::block].astype(np.uint16)
+    for i in range(1, block):
+        counts += rows[:, i::block]
+    return counts
+
+
+def runs(mask):
+    """Return the rows, starts and stops of the runs of set entries along the rows of a 2-D mask."""
+    # Each run starts at a +1 edge and stops at a -1 edge
+    edges = np.diff(mask.astype(np.int8), axis=1, prepend=0, append=0)
+    rows, starts = np.nonzero(edges == 1)
+    _, stops = np.nonzero(edges == -1)
+    return rows, starts, stops
+
+
+class Viewport:
+    """The part of a board shown in a fixed-size window, zoomed by cell or block size and panned in pixels."""
+
+    def __init__(self, dimx, dimy, width, height, cellsize, block=1):
+        self.dimx, self.dimy = dimx, dimy
+        self.width, self.height = width, height
+        self.levels = [(1, size) for size in reversed(LOD_LEVELS)] + [(size, 1) for size in ZOOM_LEVELS]
+        self.cellsize, self.block = cellsize, block     # Pixels per cell, cells per pixel
+        self.left = self.top = 0    # Window origin in board pixels, negative while the board is centred
+        self.moved = True           # Set by pan and zoom until the renderer redraws the whole view
+        self.clamp()
+
+    def units(self):
+        """Board size in units of the picture, cells or blocks of cells when zoomed out."""
+        return -(-self.dimx // self.block), -(-self.dimy // self.block)
+
+    def clamp(self):
+        """Keep the window over the board, centring a board narrower or shorter than the window."""
+        unitsx, unitsy = self.units()
+        span = unitsx * self.cellsize - self.width
+        self.left = min(max(self.left, 0), span) if span > 0 else span // 2
+        span = unitsy * self.cellsize - self.height
+        self.top = min(max(self.top, 0), span) if span > 0 else span // 2
+
+    def visible(self):
+        """Return the (x0, y0, x1, y1) units in view and the window position of unit (x0, y0)."""
+        size = self.cellsize
+        unitsx, unitsy = self.units()
+        x0, y0 = max(self.left // size, 0), max(self.top // size, 0)
+        x1 = min(-(-(self.left + self.width) // size), unitsx)
+        y1 = min(-(-(self.top + self.height) // size), unitsy)
+        return (x0, y0, x1, y1), (x0 * size - self.left, y0 * size - self.top)
+
+    def describe(self):
+        """Describe the zoom level for the HUD."""
+        if self.block == 1:
+            return f"{self.cellsize} px/cell"
+        return f"1 px/{self.block}x{self.block} cells"
+
+    def pan(self, dx, dy):
+        """Move the board by (dx, dy) window pixels, as when dragged."""
+        self.left, self.top = self.left - dx, self.top - dy
+        self.clamp()
+        self.moved = True
+
+    def zoom(self, steps, anchor):
+        """Step steps zoom levels in (or out if negative), keeping the cell under anchor in place."""
+        current = (self.cellsize, self.block)
+        level = self.levels.index(current) if current in self.levels else self.levels.index((1, 1))
+        cellsize, block = self.levels[min(max(level + steps, 0), len(self.levels) - 1)]
+        if (cellsize, block) == current:
+            return
+        ax, ay = anchor
+        scale = self.block / self.cellsize      # Cells per pixel now
+        x, y = (self.left + ax) * scale, (self.top + ay) * scale    # Board cell under anchor
+        self.cellsize, self.block = cellsize, block
+        self.left, self.top = round(x * cellsize / block - ax), round(y * cellsize / block - ay)
+        self.clamp()
+        self.moved = True
+
+
+class BoardRenderer:
+    """Draw the cells a Viewport shows through persistent palette-indexed Surfaces."""
+
+    def __init__(self, viewport, background, alive, border=None, lod_mode='density'):
+        self.viewport = viewport
+        self.rect = pygame.Rect(0, 0, viewport.width, viewport.height)
+        background, alive = pygame.Color(background), pygame.Color(alive)
+        self.palette = [background, alive, pygame.Color(border or background)]
+        self.palette += [background.lerp(alive, (i + 1) / (LOD_SHADES + 1)) for i in range(LOD_SHADES)]
+        self.lod_mode = lod_mode
+        self.window = self.surface(self.rect.size)      # The whole window's picture
+        self.view = None        # (x0, y0, x1, y1) and window position of the units drawn last
+        self.shown = None       # Copy of the units drawn last
+        self.lod = None         # Block size, tile range, reductions and stale tiles when zoomed out
+        self.pending = False    # Stale zoomed-out tiles are left for the next draw
+        self.changed = 0        # Units in view that changed in the last draw
+
+    def surface(self, size):
+        """Create an 8-bit Surface with the board palette."""
+        surface = pygame.Surface(size, depth=8)
+        surface.set_palette(self.palette)
+        return surface
+
+    def set_lod_mode(self, mode):
+        """Switch between LOD_MODES, redrawing the view."""
+        self.lod_mode, self.lod = mode, None
+        self.viewport.moved = True
+
+    def draw(self, surface, cells, changed=None):
+        """Draw the cells in view onto surface and return the window rectangles that changed.
+
+        changed is the map of CHANGE_TILE tiles changed since the last draw,
+        None if any of the board may have and False if none of it did.
+        """
+        view = self.viewport.visible()
+        (x0, y0, x1, y1), (ox, oy) = view
+        if self.viewport.block == 1:
+            units = cells[y0:y1, x0:x1]
+            self.lod = None     # The changed-tile map is not kept meanwhile, so the reductions go stale
+            self.pending = False
+        else:
+            units = self.reduce(cells, changed)
+        full = self.viewport.moved or view != self.view
+        if full:
+            # Resize the per-unit and scaled Surfaces to the new view
+            self.board = self.surface((x1 - x0, y1 - y0))
+            size = self.viewport.cellsize
+            self.scaled = self.board if size == 1 else self.surface(((x1 - x0) * size, (y1 - y0) * size))
+            self.window.fill(2)
+            self.viewport.moved, self.view = False, view
+            self.changed = units.size
+        else:
+            diff = units != self.shown
+            self.changed = int(np.count_nonzero(diff))
+            if self.changed == 0:
+                return []
+
+        pygame.surfarray.blit_array(self.board, units.T)    # surfarray indexes (x, y)
+        if self.scaled is not self.board:
+            pygame.transform.scale(self.board, self.scaled.get_size(), self.scaled)
+        self.window.blit(self.scaled, (ox, oy))
+        self.shown = units.copy()
+
+        rects = None if full else self.dirty_rects(diff)
+        if rects is None:
+            surface.blit(self.window, (0, 0))
+            return [self.rect.copy()]
+        return self.restore(surface, rects)
+
+    def reduce(self, cells, changed):
+        """Return the palette indices of the blocks in view, reducing only tiles that are stale."""
+        block = self.viewport.block
+        (x0, y0, x1, y1), _ = self.viewport.visible()
+        tx0, ty0 = x0 // LOD_TILE, y0 // LOD_TILE
+        tx1, ty1 = -(-x1 // LOD_TILE), -(-y1 // LOD_TILE)
+        tiles = (tx0, ty0, tx1, ty1)
+
+        # Keep the reductions of tiles still in view, the rest of the mosaic is stale
+        old = self.lod
+        mosaic = np.zeros(((ty1 - ty0) * LOD_TILE, (tx1 - tx0) * LOD_TILE), dtype=np.uint8)
+        stale = np.ones((ty1 - ty0, tx1 - tx0), dtype=bool)
+        start = 0   # Tile row to resume reducing from
+        if old is not None and old['block'] == block:
+            if old['tiles'] == tiles:
+                mosaic, stale, start = old['mosaic'], old['stale'], old['start']
+            else:
+                otx0, oty0, otx1, oty1 = old['tiles']
+                ax0, ay0, ax1, ay1 = max(tx0, otx0), max(ty0, oty0), min(tx1, otx1), min(ty1, oty1)
+                if ax0 < ax1 and ay0 < ay1:
+                    mosaic[(ay0 - ty0) * LOD_TILE:(ay1 - ty0) * LOD_TILE,
+                           (ax0 - tx0) * LOD_TILE:(ax1 - tx0) * LOD_TILE] = \
+                        old['mosaic'][(ay0 - oty0) * LOD_TILE:(ay1 - oty0) * LOD_TILE,
+                                      (ax0 - otx0) * LOD_TILE:(ax1 - otx0) * LOD_TILE]
+                    stale[ay0 - ty0:ay1 - ty0, ax0 - tx0:ax1 - tx0] = \
+                        old['stale'][ay0 - oty0:ay1 - oty0, ax0 - otx0:ax1 - otx0]
+        if old is None or old['block'] != block:
+            self.lut = self.lod_lut(block)
+
+        # A tile is stale if any of the changed-tile map under it is set
+        if changed is None:
+            stale[:] = True
+        elif changed is not False:
+            per = LOD_TILE * block // CHANGE_TILE      # Changed-map tiles per side of a tile
+            stale |= block_counts(changed[ty0 * per:ty1 * per, tx0 * per:tx1 * per], per)[
+                :ty1 - ty0, :tx1 - tx0] > 0
+
+        # Reduce each run of stale tiles along a tile row at once, from the row after
+        # the last one reduced, until MAX_LOD_CELLS cells were
+        size = LOD_TILE * block     # Cells per side of a tile
+        rows, starts, stops = runs(stale)
+        budget = MAX_LOD_CELLS
+        for i in np.argsort((rows - start) % stale.shape[0], kind='stable'):
+            if budget <= 0:
+                break
+            ty, sx0, sx1 = rows[i], starts[i], stops[i]
+            y, x = (ty0 + ty) * size, (tx0 + sx0) * size
+            counts = block_counts(cells[y:y + size, x:(tx0 + sx1) * size], block)
+            mosaic[ty * LOD_TILE:ty * LOD_TILE + counts.shape[0],
+                   sx0 * LOD_TILE:sx0 * LOD_TILE + counts.shape[1]] = self.lut.take(counts)
+            stale[ty, sx0:sx1] = False
+            budget -= counts.size * block * block
+            start = ty + 1
+        self.pending = bool(stale.any())
+        self.lod = {'block': block, 'tiles': tiles, 'mosaic': mosaic, 'stale': stale, 'start': start}
+        return mosaic[y0 - ty0 * LOD_TILE:y1 - ty0 * LOD_TILE, x0 - tx0 * LOD_TILE:x1 - tx0 * LOD_TILE]
+
+    def lod_lut(self, block):
+        """Map a block's living-cell count to its palette index in the current mode."""
+        counts = np.arange(block * block + 1)
+        if self.lod_mode == 'any':
+            return (counts > 0).astype(np.uint8)
+        lut = 3 + counts * LOD_SHADES // (block * block)    # Partly living blocks get a shade
+        lut[0], lut[-1] = 0, 1
+        return lut.astype(np.uint8)
+
+    def restore(self, surface, rects):
+        """Blit the board back over rects of the window (e.g. under text), returning them."""
+        for rect in rects:
+            surface.blit(self.window, rect, rect)
+        return rects
+
+    def dirty_rects(self, diff):
+        """Merge the changed units in view into window rectangles, or None when a full update is cheaper."""
+        rows, starts, stops = runs(block_counts(diff, DIRTY_TILE) > 0)
+        if len(rows) > MAX_DIRTY_RECTS:
+            return None
+        size = DIRTY_TILE * self.viewport.cellsize
+        _, (ox, oy) = self.view
+        return [pygame.Rect(ox + x0 * size, oy + y * size, (x1 - x0) * size, size).clip(self.rect)
+                for y, x0, x1 in zip(rows.tolist(), starts.tolist(), stops.tolist())]
@@ -0,0 +1,62 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Life-like rules for the Game of Life engines
+# ---------------------------------------------------------------------------
+# Parses standard B.../S... rulestrings (e.g. B36/S23 for HighLife) and
+# compiles them into a transition table indexed by
+#   state * 9 + neighbor_count
+# so an engine applies any rule with a single vectorized gather:
+#   nxt = table[cur * 9 + neighbor_count]
+# ---------------------------------------------------------------------------
+
+from functools import lru_cache
+
+import numpy as np
+
+CONWAY = 'B3/S23'
+
+# Named life-like rules, as B/S rulestrings
+RULES = {
+    'Conway': CONWAY,
+    'HighLife': 'B36/S23',
+    'Day & Night': 'B3678/S34678',
+    'Seeds': 'B2/S',
+}
+
+
+def parse_rule(rule):
+    """Parse a rule name or B/S rulestring into (birth, survival) neighbor count sets."""
+    text = RULES.get(rule, rule).upper().replace(' ', '')
+    birth = survive = None
+    for part in text.split('/'):
+        kind, digits = part[:1], part[1:]
+        if not set(digits) <= set('012345678'):
+            raise ValueError(f"Invalid rulestring '{rule}', expected e.g. B3/S23")
+        if kind == 'B' and birth is None:
+            birth = frozenset(int(d) for d in digits)
+        elif kind == 'S' and survive is None:
+            survive = frozenset(int(d) for d in digits)
+        else:
+            raise ValueError(f"Invalid rulestring '{rule}', expected e.g. B3/S23")
+    if birth is None or survive is None:
+        raise ValueError(f"Invalid rulestring '{rule}', expected e.g. B3/S23")
+    return birth, survive
+
+def rule_name(rule):
+    """Return the canonical B/S rulestring of a rule name or rulestring."""
+    birth, survive = parse_rule(rule)
+    return 'B' + ''.join(map(str, sorted(birth))) + '/S' + ''.join(map(str, sorted(survive)))
+
+@lru_cache(maxsize=None)
+def compile_rule(rule=CONWAY):
+    """Compile a rule into a read-only uint8 table indexed by state * 9 + neighbor count."""
+    birth, survive = parse_rule(rule)
+    table = np.zeros(18, dtype=np.uint8)
+    table[list(birth)] = 1
+    table[[9 + n for n in survive]] = 1
+    table.flags.writeable = False
+    return table
+
+def is_conway(rule):
+    """Check whether a rule is Conway's B3/S23."""
+    return rule_name(rule) == CONWAY
@@ -0,0 +1,123 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Sparse coordinate-set engine for Conway's Game of Life
+# ---------------------------------------------------------------------------
+# Stores only the living cells, as a sorted int64 array of packed
+# coordinates (key = y * 2**32 + x). Each generation adds the eight
+# neighbor offsets to every key, counts the candidates with np.unique and
+# keeps the ones the rules allow, so memory and step time scale with the
+# population instead of with the board area.
+#
+# Works on the existing wrap and no-wrap rectangular boards, and on an
+# unbounded plane where coordinates may grow in any direction (including
+# negative ones) up to +/- 2**31.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+
+STRIDE = 1 << 32
+HALF_STRIDE = 1 << 31
+OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+
+
+def encode(ys, xs):
+    """Pack row and column arrays into int64 keys."""
+    return np.asarray(ys, dtype=np.int64) * STRIDE + np.asarray(xs, dtype=np.int64)
+
+def decode(keys):
+    """Unpack int64 keys into row and column arrays."""
+    ys = (keys + HALF_STRIDE) >> 32
+    return ys, keys - ys * STRIDE
+
+class SparseEngine:
+    """Keep the living cells as sorted packed coordinates and step only around them."""
+
+    def __init__(self, cells, wrap, bounded=True):
+        self.dimy, self.dimx = cells.shape
+        self.wrap = wrap
+        self.bounded = bounded
+        self.keys = encode(*np.nonzero(cells))
+
+    @classmethod
+    def from_coordinates(cls, ys, xs, dimy, dimx, wrap=False, bounded=True):
+        """Create an engine straight from living cell coordinates, without a dense board."""
+        engine = cls.__new__(cls)
+        engine.dimy, engine.dimx = dimy, dimx
+        engine.wrap = wrap
+        engine.bounded = bounded
+        engine.keys = np.unique(encode(ys, xs))
+        return engine
+
+    def _neighbor_keys(self):
+        """Return the keys of all eight neighbors of every living cell."""
+        if not self.bounded:
+            # On the unbounded plane a neighbor is a fixed offset in key space
+            return np.concatenate([self.keys + (dy * STRIDE + dx) for dy, dx in OFFSETS])
+
+        ys, xs = decode(self.keys)
+        neighbors = []
+        for dy, dx in OFFSETS:
+            ny, nx = ys + dy, xs + dx
+            if self.wrap:
+                ny %= self.dimy
+                nx %= self.dimx
+            else:
+                # Neighbors past the edge are dead and never counted
+                inside = (ny >= 0) & (ny < self.dimy) & (nx >= 0) & (nx < self.dimx)
+                ny, nx = ny[inside], nx[inside]
+            neighbors.append(encode(ny, nx))
+        return np.concatenate(neighbors)
+
+    def step(self):
+        """Advance one generation and return the (births, deaths) counts."""
+        candidates, counts = np.unique(self._neighbor_keys(), return_counts=True)
+
+        # Which candidates are alive now, found by binary search in the sorted keys
+        pos = np.searchsorted(self.keys, candidates)
+        alive = pos < len(self.keys)
+        alive[alive] = self.keys[pos[alive]] == candidates[alive]
+
+        born = (counts == 3) & ~alive
+        survive = alive & ((counts == 2) | (counts == 3))
+        births = int(np.count_nonzero(born))
+        deaths = len(self.keys) - int(np.count_nonzero(survive))
+
+        # np.unique returns sorted candidates, so the new keys stay sorted
+        self.keys = candidates[born | survive]
+        return births, deaths
+
+    def population(self):
+        """Count the living cells."""
+        return len(self.keys)
+
+    def state(self):
+        """Return the sorted packed coordinates of the living cells."""
+        return self.keys
+
+    def coordinates(self):
+        """Return the living cells as row and column arrays."""
+        return decode(self.keys)
+
+    def bounding_box(self):
+        """Return (y0, x0, y1, x1) around the living cells, or None when empty."""
+        if len(self.keys) == 0:
+            return None
+        ys, xs = decode(self.keys)
+        return int(ys.min()), int(xs.min()), int(ys.max()) + 1, int(xs.max()) + 1
+
+    def get_cells(self, y=0, x=0, dimy=None, dimx=None):
+        """Return a dense window of the board, by default the original board."""
+        dimy = self.dimy if dimy is None else dimy
+        dimx = self.dimx if dimx is None else dimx
+        out = np.zeros((dimy, dimx), dtype=np.uint8)
+        ys, xs = decode(self.keys)
+        ys, xs = ys - y, xs - x
+        inside = (ys >= 0) & (ys < dimy) & (xs >= 0) & (xs < dimx)
+        out[ys[inside], xs[inside]] = 1
+        return out
+
+class UnboundedSparseEngine(SparseEngine):
+    """Sparse engine on an unbounded plane, starting from a dense board at the origin."""
+
+    def __init__(self, cells, wrap=False):
+        super().__init__(cells, wrap=False, bounded=False)
@@ -0,0 +1,121 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Row-diffing terminal renderer for the curses Game of Life
+# ---------------------------------------------------------------------------
+# TerminalRenderer keeps a scroll position over the board and turns only the
+# cells that fit on the screen from there into one string per screen row;
+# cells off-screen are never packed or compared. It keeps the character
+# codes it wrote last.
+# Each frame it compares the new codes with those row by row and writes
+# only the span between the first and last changed character of each
+# changed row, with one addstr call, so a frame costs at most one curses
+# call per screen row however many cells changed.
+#
+# Cells are packed into characters by one of RENDER_MODES:
+#   block    one cell per character, 'O' alive
+#   half     Unicode half blocks, a column of 2 cells per character
+#   braille  Unicode Braille patterns, 2 columns of 4 cells per character
+# Packing is a vectorized reshape of the board into character-sized blocks
+# and a sum of each cell times its bit, and every row string is decoded
+# from the code points in one call.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+
+RENDER_MODES = ('block', 'half', 'braille')
+
+# Cells per character as (rows, columns), and the bit each cell sets in the character's code
+CELL_BITS = {
+    'block': np.array([[1]]),
+    'half': np.array([[1], [2]]),
+    'braille': np.array([[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]]),
+}
+
+# Code point of each character code, little-endian so rows decode as UTF-32-LE
+GLYPHS = {
+    'block': np.array([ord(' '), ord('O')], dtype='<u4'),
+    'half': np.array([ord(' '), ord('▀'), ord('▄'), ord('█')], dtype='<u4'),
+    'braille': (0x2800 + np.arange(256)).astype('<u4'),     # Blank Braille cell for no dots
+}
+
+
+def supports_unicode(stdscr):
+    """Whether the terminal encoding can show the half-block and Braille characters."""
+    try:
+        '█⣿'.encode(getattr(stdscr, 'encoding', None) or 'ascii')
+    except (UnicodeEncodeError, LookupError):
+        return False
+    return True
+
+
+class TerminalRenderer:
+    """Draw a board on a curses window, rewriting only the spans of rows that changed."""
+
+    def __init__(self, dimx, dimy, mode='block'):
+        self.dimx, self.dimy = dimx, dimy
+        self.mode = mode
+        self.top = self.left = 0    # Board cell shown in the top left character
+        self.codes = None   # Code points written last, one row per screen row
+
+    def reset(self):
+        """Forget what is on the screen (e.g. after clear()), the next draw writes every row."""
+        self.codes = None
+
+    def next_mode(self, unicode=True):
+        """Switch to the next of RENDER_MODES, only block without Unicode, and redraw everything."""
+        modes = RENDER_MODES if unicode else RENDER_MODES[:1]
+        self.mode = modes[(modes.index(self.mode) + 1) % len(modes)] if self.mode in modes else modes[0]
+        self.reset()
+        return self.mode
+
+    def cell_size(self):
+        """Cells per character as (rows, columns) in the current mode."""
+        return CELL_BITS[self.mode].shape
+
+    def scroll(self, dy, dx):
+        """Scroll by dy rows and dx columns of characters, kept on the board by the next view()."""
+        h, w = self.cell_size()
+        self.top, self.left = self.top + dy * h, self.left + dx * w
+
+    def view(self, stdscr, rows):
+        """Return the (y0, x0, y1, x1) board cells that fit in the top rows screen rows."""
+        max_y, max_x = stdscr.getmaxyx()
+        h, w = self.cell_size()
+        height, width = max(min(rows, max_y), 0) * h, max_x * w
+        self.top = min(max(self.top, 0), max(self.dimy - height, 0))
+        self.left = min(max(self.left, 0), max(self.dimx - width, 0))
+        return self.top, self.left, min(self.top + height, self.dimy), min(self.left + width, self.dimx)
+
+    def encode(self, cells):
+        """Pack cells into an array of code points, one per character."""
+        bits = CELL_BITS[self.mode]
+        h, w = bits.shape
+        if h * w == 1:
+            return GLYPHS[self.mode].take(cells)
+        pad = (-cells.shape[0] % h, -cells.shape[1] % w)
+        if pad != (0, 0):
+            cells = np.pad(cells, ((0, pad[0]), (0, pad[1])))
+        blocks = cells.reshape(cells.shape[0] // h, h, cells.shape[1] // w, w)
+        codes = np.zeros((blocks.shape[0], blocks.shape[2]), dtype=np.uint16)
+        for (i, j), bit in np.ndenumerate(bits):
+            codes += blocks[:, i, :, j] * np.uint16(bit)
+        return GLYPHS[self.mode].take(codes)
+
+    def draw(self, stdscr, cells, rows):
+        """Draw the cells in view into the top rows screen rows, returning the number of addstr calls."""
+        y0, x0, y1, x1 = self.view(stdscr, rows)
+        codes = self.encode(cells[y0:y1, x0:x1])
+
+        # Rows and the first and last column that differ from what was written last
+        if self.codes is None or self.codes.shape != codes.shape:
+            changed = np.ones(codes.shape, dtype=bool)
+        else:
+            changed = codes != self.codes
+        self.codes = codes
+        calls = 0
+        for y in np.nonzero(changed.any(axis=1))[0].tolist():
+            cols = np.nonzero(changed[y])[0]
+            x0, x1 = int(cols[0]), int(cols[-1]) + 1
+            stdscr.addstr(y, x0, codes[y, x0:x1].tobytes().decode('utf-32-le'))
+            calls += 1
+        return calls
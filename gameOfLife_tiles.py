@@ -0,0 +1,182 @@
+# ---------------------------------------------------------------------------
+# SEGA97
+# Tile-based active-region stepping for Conway's Game of Life
+# ---------------------------------------------------------------------------
+# Splits the board into fixed TILE_SIZE x TILE_SIZE tiles and remembers
+# which tiles changed in the last generation. Only those tiles, and the
+# neighboring tiles their changes touch, are recomputed on the next step:
+# a tile whose neighborhood did not change cannot change either. On
+# settled boards the cost per generation scales with activity rather than
+# with board area.
+#
+# Once more than DENSE_FRACTION of the tiles are active, looping over them
+# costs more than stepping the whole board at once, so the whole board is
+# computed in one vectorized call and the active tiles are derived from its
+# diff instead.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+
+from gameOfLife_rules import CONWAY, compile_rule
+
+TILE_SIZE = 32
+DENSE_FRACTION = 0.25   # Active tile fraction above which the whole board is stepped at once
+
+
+def _next_block(block, table):
+    """Apply a rule table to a block carrying a one cell halo, returning the interior."""
+    neighbor_count = (
+        block[:-2, :-2] + block[:-2, 1:-1] + block[:-2, 2:] +
+        block[1:-1, :-2] +                   block[1:-1, 2:] +
+        block[2:, :-2] + block[2:, 1:-1] + block[2:, 2:]
+    )
+    return table.take(block[1:-1, 1:-1] * 9 + neighbor_count)
+
+def _spread(reach, wrap):
+    """Combine per-direction reach masks into the set of tiles to recompute.
+
+    reach[dy + 1, dx + 1] marks the tiles whose changes touch the neighbor
+    at tile offset (dy, dx), so that neighbor has to be recomputed as well.
+    """
+    rows, cols = reach.shape[2:]
+    active = np.zeros((rows, cols), dtype=bool)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            mask = reach[dy + 1, dx + 1]
+            if wrap:
+                active |= np.roll(mask, (dy, dx), axis=(0, 1))
+                continue
+            # Without wrapping, reach past the edge of the board is dropped
+            active[max(dy, 0):rows + min(dy, 0), max(dx, 0):cols + min(dx, 0)] |= \
+                mask[max(-dy, 0):rows + min(-dy, 0), max(-dx, 0):cols + min(-dx, 0)]
+    return active
+
+class TiledEngine:
+    """Keep a dense board and only recompute tiles near the last changes."""
+
+    def __init__(self, cells, wrap, tile=TILE_SIZE, rule=CONWAY):
+        self.cells = (cells != 0).astype(np.uint8)
+        self.wrap = wrap
+        self.table = compile_rule(rule)
+        self.tile = tile
+        self.dimy, self.dimx = self.cells.shape
+
+        # Every tile is active until the first step shows otherwise
+        tiles_y = -(-self.dimy // tile)
+        tiles_x = -(-self.dimx // tile)
+        self.active = np.ones((tiles_y, tiles_x), dtype=bool)
+
+    def _halo_block(self, y0, y1, x0, x1):
+        """Return the cells of a tile with a one cell border around it."""
+        cells = self.cells
+        if y0 > 0 and x0 > 0 and y1 < self.dimy and x1 < self.dimx:
+            # Interior tile, a plain slice already includes the border
+            return cells[y0 - 1:y1 + 1, x0 - 1:x1 + 1]
+
+        if self.wrap:
+            # Edge tile, pull the border from the opposite edge of the board
+            rows = np.arange(y0 - 1, y1 + 1) % self.dimy
+            cols = np.arange(x0 - 1, x1 + 1) % self.dimx
+            return cells[np.ix_(rows, cols)]
+
+        # Edge tile without wrapping, the border outside the board is dead
+        block = cells[max(y0 - 1, 0):min(y1 + 1, self.dimy), max(x0 - 1, 0):min(x1 + 1, self.dimx)]
+        pad = ((int(y0 == 0), int(y1 == self.dimy)), (int(x0 == 0), int(x1 == self.dimx)))
+        return np.pad(block, pad)
+
+    def _step_dense(self):
+        """Step the whole board at once and derive the active tiles from the diff."""
+        tile = self.tile
+        padded = np.pad(self.cells, 1, mode='wrap' if self.wrap else 'constant')
+        new = _next_block(padded, self.table)
+        diff = new != self.cells
+
+        # First and last row and column of every tile, the last tiles may be partial
+        top = np.arange(0, self.dimy, tile)
+        left = np.arange(0, self.dimx, tile)
+        bottom = np.minimum(top + tile, self.dimy) - 1
+        right = np.minimum(left + tile, self.dimx) - 1
+        rows = np.logical_or.reduceat(diff, top, axis=0)
+
+        reach = np.empty((3, 3) + self.active.shape, dtype=bool)
+        reach[1, 1] = np.logical_or.reduceat(rows, left, axis=1)
+        reach[0, 1] = np.logical_or.reduceat(diff[top], left, axis=1)
+        reach[2, 1] = np.logical_or.reduceat(diff[bottom], left, axis=1)
+        reach[1, 0] = np.logical_or.reduceat(diff[:, left], top, axis=0)
+        reach[1, 2] = np.logical_or.reduceat(diff[:, right], top, axis=0)
+        reach[0, 0] = diff[np.ix_(top, left)]
+        reach[0, 2] = diff[np.ix_(top, right)]
+        reach[2, 0] = diff[np.ix_(bottom, left)]
+        reach[2, 2] = diff[np.ix_(bottom, right)]
+        self.active = _spread(reach, self.wrap)
+
+        births = np.nonzero(diff & (new == 1))
+        deaths = np.nonzero(diff & (new == 0))
+        self.cells = new
+        return births, deaths
+
+    def step_cells(self):
+        """Advance one generation and return the births and deaths as (rows, cols) arrays."""
+        if self.active.mean() > DENSE_FRACTION:
+            return self._step_dense()
+        tile = self.tile
+        reach = np.zeros((3, 3) + self.active.shape, dtype=bool)
+        updates = []
+        births_y, births_x, deaths_y, deaths_x = [], [], [], []
+
+        # Compute every active tile from the current board before writing any back
+        for ty, tx in zip(*np.nonzero(self.active)):
+            y0, x0 = ty * tile, tx * tile
+            y1, x1 = min(y0 + tile, self.dimy), min(x0 + tile, self.dimx)
+            old = self.cells[y0:y1, x0:x1]
+            new = _next_block(self._halo_block(y0, y1, x0, x1), self.table)
+            diff = new != old
+            if not diff.any():
+                continue
+
+            # The tile itself, plus each neighbor that borders a changed cell
+            top, bottom, left, right = diff[0], diff[-1], diff[:, 0], diff[:, -1]
+            reach[1, 1, ty, tx] = True
+            reach[0, 1, ty, tx] = top.any()
+            reach[2, 1, ty, tx] = bottom.any()
+            reach[1, 0, ty, tx] = left.any()
+            reach[1, 2, ty, tx] = right.any()
+            reach[0, 0, ty, tx] = top[0]
+            reach[0, 2, ty, tx] = top[-1]
+            reach[2, 0, ty, tx] = bottom[0]
+            reach[2, 2, ty, tx] = bottom[-1]
+            updates.append((y0, y1, x0, x1, new))
+            born_y, born_x = np.nonzero(diff & (new == 1))
+            died_y, died_x = np.nonzero(diff & (new == 0))
+            births_y.append(born_y + y0)
+            births_x.append(born_x + x0)
+            deaths_y.append(died_y + y0)
+            deaths_x.append(died_x + x0)
+
+        for y0, y1, x0, x1, new in updates:
+            self.cells[y0:y1, x0:x1] = new
+
+        # Next generation only needs the changed tiles and the neighbors they touch
+        self.active = _spread(reach, self.wrap)
+
+        empty = np.zeros(0, dtype=np.intp)
+        births = (np.concatenate(births_y or [empty]), np.concatenate(births_x or [empty]))
+        deaths = (np.concatenate(deaths_y or [empty]), np.concatenate(deaths_x or [empty]))
+        return births, deaths
+
+    def step(self):
+        """Advance one generation and return the (births, deaths) counts."""
+        births, deaths = self.step_cells()
+        return len(births[0]), len(deaths[0])
+
+    def active_fraction(self):
+        """Return the fraction of tiles that will be recomputed on the next step."""
+        return float(self.active.mean())
+
+    def population(self):
+        """Count the living cells."""
+        return int(np.count_nonzero(self.cells))
+
+    def get_cells(self):
+        """Return the board as a dense array."""
+        return self.cells
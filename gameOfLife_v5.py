@@ -13,10 +13,34 @@
 #     Get Glider pattersn from CSVs
 #     Implemented Restart feature
 #     Implemented clock speed control
+#     Added a rule menu for life-like rules (HighLife, Day & Night, Seeds)
+#     Detects still lifes and short cycles, and stops stepping once settled
+#     Saves memory-mapped checkpoints (K key and on quit) and resumes them
+#     Records replays to disk from a background thread (V key)
+#     Replay viewer with keyframe seeking, fast forward and backward playback
+#     Performance overlay with per-phase frame timings (H key)
+#     Steps the board on a producer thread, redrawing at the display rate and skipping frames
+#     Draws the whole board with one surfarray blit instead of a rect per cell
+#     Pushes only dirty rectangles and the HUD rows to the display
+#     Fixed-size window over a viewport, zoomed with the mouse wheel and panned by dragging
+#     Zoomed out past a pixel per cell, shows blocks of cells by density (L switches to any-alive)
 # ---------------------------------------------------------------------------
 
+import os
+import time
+
 import pygame
-import numpy as np
+
+from gameOfLife_checkpoint import CHECKPOINT_DIR, checkpoint_exists, load_checkpoint, save_checkpoint
+from gameOfLife_cycles import describe_cycle
+from gameOfLife_engine import (init_game_state, random_pattern,
+                               check_memory_budget, new_seed)
+from gameOfLife_hashlife import HashLife, jump_ahead
+from gameOfLife_perf import PhaseTimer
+from gameOfLife_producer import SimulationThread
+from gameOfLife_recorder import REPLAY_SPEEDS, Recorder, Replay, latest_recording
+from gameOfLife_render import LOD_MODES, BoardRenderer, Viewport
+from gameOfLife_rules import RULES, is_conway, rule_name
 
 # Constants
 COLORS = {
@@ -30,12 +54,23 @@ COLORS = {
 GAME_VARS = {
     # 'start': None,  # Game start flag
     # 'wrap': None,  # Wrap cells flag
+    # 'rule': None,  # Life-like rule name
     # 'glider': None,  # Gosper's glider gun flag
     # 'glider_count': None,  # Number of glider guns
     # 's_size': None,  # World size
     # 'c_size': None,  # Cell size
     # 'c_prob': None  # Probability of cells being alive initially
 }
+JUMP_EXPONENT = 10  # J key jumps ahead up to 2**JUMP_EXPONENT generations, less near the board edge
+STOP_ON_CYCLE = True  # Stop stepping and redrawing once a cycle is confirmed
+CHECKPOINT_PATH = os.path.join(CHECKPOINT_DIR, 'gameOfLife_v5')  # Saved by K and on quit
+RECORD_DIR = 'recordings'  # Replays started with V are written here
+PERF_PHASES = ('frame', 'draw', 'text', 'tick', 'display')  # Frame phases timed by the H overlay
+DISPLAY_FPS = 60  # Redraws per second, the simulation runs at its own clock speed
+HUD_TOP = 18  # Height of the top text row (REC, checkpoint saved), redrawn every frame
+HUD_BOTTOM = 108  # Height of the bottom text rows, redrawn every frame
+REPLAY_FPS = 30  # Frames per second of the replay viewer, REPLAY_SPEEDS sets the records per frame
+WINDOW_SIZE = (960, 720)  # Game and replay window, larger boards are zoomed and panned inside it
 
 # Initialize Pygame
 pygame.init()
@@ -44,6 +79,7 @@ FONT = pygame.font.SysFont("monospace", 16)
 def reset_GAME_VARS():
     GAME_VARS['start'] = None  # Game start flag
     GAME_VARS['wrap'] = None  # Wrap cells flag
+    GAME_VARS['rule'] = None  # Life-like rule name
     GAME_VARS['glider'] = None  # Gosper's glider gun flag
     GAME_VARS['glider_count'] = None  # Number of glider guns
     GAME_VARS['s_size'] = None  # World size
@@ -51,90 +87,33 @@ def reset_GAME_VARS():
     GAME_VARS['c_prob'] = None  # Probability of cells being alive initially
     return
 
-def init_game_state(dimx, dimy, pattern=None, glider_count=None):
-    """Initialize the game state with specified dimensions and pattern."""
-
-    # Create an empty grid of specified dimensions
-    cells = np.zeros((dimy, dimx)) 
-    if glider_count == 1:
-        # Initialize with Gosper's glider gun
-        pattern = np.genfromtxt("glider.csv",
-                    delimiter=",", dtype=int)
-        
-    elif glider_count == 2:
-        # Initialize with two Gosper's glider guns
-        pattern = np.genfromtxt("gliders.csv",
-                    delimiter=",", dtype=int)
-        
-    if (glider_count == 1 or glider_count == 2):
-        # Position the pattern in the game grid
-        pos = (3,3) # Position where the pattern starts
-        cells[pos[0]:pos[0]+pattern.shape[0], pos[1]:pos[1]+pattern.shape[1]] = pattern
-    
-    else:
-        cells[:pattern.shape[0], :pattern.shape[1]] = pattern
-    
-    return cells
+def make_renderer(dimx, dimy, sz):
+    """Create the renderer for a window-sized viewport at cell size sz, in the game colors."""
+    viewport = Viewport(dimx, dimy, WINDOW_SIZE[0], WINDOW_SIZE[1], sz)
+    return BoardRenderer(viewport, COLORS['background'], COLORS['alive'], COLORS['grid'])
 
-def update_game_state(cur, sz, wrap):
-    """Update the game state for the next generation."""
-    
-    # Pad the current array if wrap is False
-    if not wrap:
-        cur = np.pad(cur, pad_width=1, mode='constant') 
-    
-    # Create a new array for the next generation
-    nxt = np.zeros_like(cur)
-
-    # Use Numpy array operations for neighbor counting and updating
-    neighbor_count = (
-        np.roll(cur, (-1, -1), axis=(0, 1)) + 
-        np.roll(cur, (-1, 0), axis=(0, 1)) + 
-        np.roll(cur, (-1, 1), axis=(0, 1)) + 
-        np.roll(cur, (0, -1), axis=(0, 1)) + 
-        np.roll(cur, (0, 1), axis=(0, 1)) + 
-        np.roll(cur, (1, -1), axis=(0, 1)) + 
-        np.roll(cur, (1, 0), axis=(0, 1)) + 
-        np.roll(cur, (1, 1), axis=(0, 1))
-    )
-
-    # Apply Conway's Game of Life rules using Numpy broadcasting
-    nxt[(cur == 1) & ((neighbor_count < 2) | (neighbor_count > 3))] = 0
-    nxt[(cur == 1) & ((neighbor_count == 2) | (neighbor_count == 3))] = 1
-    nxt[(cur == 0) & (neighbor_count == 3)] = 1
-
-    changed_indices = []
-    # Iterate through each index and value in the next generation array (nxt)
-    for idx, val in np.ndenumerate(nxt):
-        # If the cell in the current generation array (cur) is different
-        if cur[idx] != val:
-            # Add its position (scaled by cell size) to changed_indices
-            changed_indices.append((idx[1] * sz, idx[0] * sz))
-            # Update the current generation array (cur) with the new value from the next generation
-            cur[idx] = val
-
-    # Return the next generation array and changed indices
-    if not wrap:
-        nxt = nxt[1:-1, 1:-1]
-        changed_indices = [(x - 1, y - 1) for x, y in changed_indices]
-
-    return nxt, changed_indices
-
-def draw_cells(surface, cur, sz, changed_indices):
-    """Draw the cells on the game surface."""
-
-    # Fill the surface with background color
-    surface.fill(COLORS['background'])
-    for pos in changed_indices:
-        # Check if the indices are within bounds of the cur array
-        if pos[1] // sz < cur.shape[0] and pos[0] // sz < cur.shape[1]:
-            color = COLORS['alive'] if cur[pos[1] // sz, pos[0] // sz] == 1 else COLORS['background']
-            # Draw cell rectangle
-            pygame.draw.rect(surface, color, pygame.Rect(pos[0], pos[1], sz, sz))
-
-def render_game_info(surface, gen, speed):
+def render_game_info(surface, gen, speed, rule, cycle=None, recording=False, zoom=None, jump_note=None):
     """Render game information on the game surface."""
 
+    # Recording indicator
+    if recording:
+        rec = FONT.render('REC', True, COLORS['text'])
+        surface.blit(rec, (surface.get_width() - rec.get_width(), 0))
+
+    # Cycle text
+    stopped = ', stepping stopped' if cycle is not None and STOP_ON_CYCLE else ''
+    cycle_text = FONT.render(f"Cycle: {describe_cycle(cycle)}{stopped}", 1, COLORS['text'])
+    surface.blit(cycle_text, (0, surface.get_height() - 70))
+
+    # Rule text
+    rule_text = FONT.render(f"Rule: {rule_name(rule)}", 1, COLORS['text'])
+    surface.blit(rule_text, (0, surface.get_height() - 52))
+
+    # Zoom text
+    if zoom is not None:
+        zoom_text = FONT.render(f"Zoom: {zoom}, scroll to zoom, drag to pan", 1, COLORS['text'])
+        surface.blit(zoom_text, (0, surface.get_height() - 88))
+
     # Generation text
     gentext = FONT.render(f"Generation: {gen}", 1, COLORS['text'])
     surface.blit(gentext, (0, surface.get_height() - 16))    
@@ -143,6 +122,23 @@ def render_game_info(surface, gen, speed):
     gen_speed = FONT.render(f"Game Speed: {speed}", 1, COLORS['text'])
     surface.blit(gen_speed, (0, surface.get_height() - 34))    
 
+    # Jump instructions text, the jump is exact so it stops before the pattern reaches the edge
+    jump = FONT.render(jump_note or f'Press J to Jump up to {2 ** JUMP_EXPONENT} Generations, Stops Near the Edge',
+                       True, COLORS['text'])
+    surface.blit(jump, (surface.get_width() - jump.get_width(), surface.get_height() - 52))
+
+    # Checkpoint instructions text
+    save = FONT.render('Press K to Save a Checkpoint', True, COLORS['text'])
+    surface.blit(save, (surface.get_width() - save.get_width(), surface.get_height() - 70))
+
+    # Recording instructions text
+    record = FONT.render('Press V to Start/Stop Recording', True, COLORS['text'])
+    surface.blit(record, (surface.get_width() - record.get_width(), surface.get_height() - 88))
+
+    # Performance overlay instructions text
+    overlay = FONT.render('Press H for the Performance Overlay', True, COLORS['text'])
+    surface.blit(overlay, (surface.get_width() - overlay.get_width(), surface.get_height() - 106))
+
     # Pause instructions text
     instructions = FONT.render('Press P to Pause',True, COLORS['text'])
     surface.blit(instructions, (surface.get_width() - instructions.get_width(), surface.get_height() - 34))    
@@ -151,15 +147,54 @@ def render_game_info(surface, gen, speed):
     start = FONT.render('Pause and press S to Return to Start',True, COLORS['text'])
     surface.blit(start, (surface.get_width() - start.get_width() , surface.get_height() - 16))    
     
-def handle_events(clock_speed):
+def hud_rects(surface, overlay=False):
+    """Return the window rectangles holding text, the performance overlay included if shown."""
+    width, height = surface.get_size()
+    top = HUD_TOP + (18 * (len(PERF_PHASES) + 4) if overlay else 0)
+    return [pygame.Rect(0, 0, width, min(top, height)),
+            pygame.Rect(0, max(height - HUD_BOTTOM, 0), width, min(HUD_BOTTOM, height))]
+
+def render_perf_overlay(surface, timer, clock, simulation, speed, renderer):
+    """Render the rolling frame timings and throughput in the top left corner."""
+    lines = [f"{phase:<8} avg {mean:6.2f} ms  p99 {p99:6.2f} ms" for phase, (mean, p99) in timer.stats().items()]
+    lines.append(f"Gen/s: {simulation.measured_rate():.1f} actual, {speed} requested")
+    lines.append(f"Frames/s: {clock.get_fps():.1f} of {DISPLAY_FPS}")
+    lines.append(f"Changed cells in view: {renderer.changed}")
+    lines.append(f"Population: {simulation.population}")
+    for i, line in enumerate(lines):
+        surface.blit(FONT.render(line, True, COLORS['text']), (0, 18 + i * 18))
+
+def handle_view_event(event, viewport):
+    """Zoom the viewport with the mouse wheel and pan it by dragging, returning True if event did."""
+    if event.type == pygame.MOUSEWHEEL:
+        viewport.zoom(event.y, pygame.mouse.get_pos())
+        return True
+    if event.type == pygame.MOUSEMOTION and event.buttons[0]:
+        viewport.pan(*event.rel)
+        return True
+    return False
+
+def handle_events(clock_speed, viewport):
     """Handle Pygame events."""
 
     for event in pygame.event.get():
         keys = pygame.key.get_pressed()
+        if handle_view_event(event, viewport):
+            continue
         if event.type == pygame.QUIT:
-            quit_game()
+            return False, 'quit', clock_speed
         if event.type == pygame.KEYDOWN and keys[pygame.K_p]:
             return True, 'paused', clock_speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_j]:
+            return True, 'jump', clock_speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_k]:
+            return True, 'save', clock_speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_v]:
+            return True, 'record', clock_speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_h]:
+            return True, 'overlay', clock_speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_l]:
+            return True, 'lod', clock_speed
         if keys[pygame.K_DOWN]:
             if clock_speed > 1: clock_speed-=1
             return True, 'running', clock_speed
@@ -174,48 +209,283 @@ def quit_game():
     pygame.quit()
     quit()
 
-def handle_pause():
+def handle_pause(viewport):
     """Handle pause state."""    
     for event in pygame.event.get():
         keys = pygame.key.get_pressed()
+        handle_view_event(event, viewport)  # Pan and zoom while paused
         if event.type == pygame.QUIT:
-            return False, 'stopped'
+            return 'quit'
         elif event.type == pygame.KEYDOWN and keys[pygame.K_r]:
             return 'running' # Return running state if R key is pressed
         elif event.type == pygame.KEYDOWN and keys[pygame.K_s]:
             return 'restart' 
+        elif event.type == pygame.KEYDOWN and keys[pygame.K_k]:
+            return 'save'
     return 'paused'
 
-def game_loop(dimx, dimy, cellsize, wrap, glider_count=None, pattern=None):
-    """Main game loop."""
+def save_game(surface, cells, gen, cellsize, wrap, rule, seed, glider_count):
+    """Write the running game to the checkpoint and confirm it on screen."""
+    save_checkpoint(CHECKPOINT_PATH, cells, gen, wrap, rule, seed,
+                    c_size=cellsize, glider_count=glider_count)
+    saved = FONT.render(f'Checkpoint saved at generation {gen}', True, COLORS['text'])
+    pygame.display.update(surface.blit(saved, (0, 0)))
+
+def start_recording(cells, gen, wrap, rule, seed):
+    """Open a new replay file and record the current board as its first keyframe."""
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    base = os.path.join(RECORD_DIR, time.strftime('gameOfLife_v5_%Y%m%d_%H%M%S'))
+    path, n = base + '.golr', 1
+    while os.path.exists(path):     # Toggled more than once within a second
+        path, n = f"{base}_{n}.golr", n + 1
+    recorder = Recorder(path, cells.shape, wrap, rule, seed)
+    recorder.record(gen, cells)
+    return recorder
+
+def render_replay_info(surface, replay, record, speed):
+    """Render replay information on the replay surface."""
+
+    # Record and generation text
+    position = FONT.render(f"Replay: record {record + 1} of {len(replay)}", 1, COLORS['text'])
+    surface.blit(position, (0, surface.get_height() - 52))
+    gentext = FONT.render(f"Generation: {replay.generations[record]}", 1, COLORS['text'])
+    surface.blit(gentext, (0, surface.get_height() - 16))
+
+    # Replay speed text, negative speeds play backward
+    direction = 'backward' if speed < 0 else 'forward'
+    speed_text = FONT.render(f"Replay Speed: {abs(speed)} records/frame {direction}", 1, COLORS['text'])
+    surface.blit(speed_text, (0, surface.get_height() - 34))
+
+    # Seek instructions text
+    seek = FONT.render('Press LEFT/RIGHT to Seek Keyframes', True, COLORS['text'])
+    surface.blit(seek, (surface.get_width() - seek.get_width(), surface.get_height() - 52))
+
+    # Pause instructions text
+    instructions = FONT.render('Press P to Pause', True, COLORS['text'])
+    surface.blit(instructions, (surface.get_width() - instructions.get_width(), surface.get_height() - 34))
+
+    # Return to start
+    start = FONT.render('Pause and press S to Return to Start', True, COLORS['text'])
+    surface.blit(start, (surface.get_width() - start.get_width(), surface.get_height() - 16))
+
+def handle_replay_events(speed, viewport):
+    """Handle Pygame events in the replay viewer, speed indexes REPLAY_SPEEDS."""
+
+    for event in pygame.event.get():
+        keys = pygame.key.get_pressed()
+        if handle_view_event(event, viewport):
+            continue
+        if event.type == pygame.QUIT:
+            return False, 'quit', speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_p]:
+            return True, 'paused', speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_LEFT]:
+            return True, 'seek_back', speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_RIGHT]:
+            return True, 'seek_forward', speed
+        if event.type == pygame.KEYDOWN and keys[pygame.K_DOWN]:
+            return True, 'running', max(speed - 1, 0)
+        if event.type == pygame.KEYDOWN and keys[pygame.K_UP]:
+            return True, 'running', min(speed + 1, len(REPLAY_SPEEDS) - 1)
+
+    # Return running flag and state
+    return True, 'running', speed
+
+def replay_loop(path):
+    """Play a recording back, rebuilding frames from its keyframes instead of re-simulating."""
+
+    replay = Replay(path)
+    dimy, dimx = replay.shape
+    cellsize = max(1, min(8, WINDOW_SIZE[0] // dimx, WINDOW_SIZE[1] // dimy))
+    surface = pygame.display.set_mode(WINDOW_SIZE)
+    pygame.display.set_caption("Py Game of Life - Replay")
+    renderer = make_renderer(dimx, dimy, cellsize)
+
+    # Only the board of the current frame is kept
+    record = 0
+    cells = replay.frame(record)
+    renderer.draw(surface, cells)
+
+    clock = pygame.time.Clock()
+    speed = REPLAY_SPEEDS.index(1)
+    running = True
+    state = 'running'
+    render_replay_info(surface, replay, record, REPLAY_SPEEDS[speed])
+    pygame.display.update()
+
+    while running:
+        clock.tick(REPLAY_FPS)
+        running, state, speed = handle_replay_events(speed, renderer.viewport)
+        target = record
+        if state == 'running':
+            target = min(max(record + REPLAY_SPEEDS[speed], 0), len(replay) - 1)
+        elif state == 'seek_back':
+            target = replay.seek_keyframe(record, -1)
+        elif state == 'seek_forward':
+            target = replay.seek_keyframe(record, 1)
+
+        # Draw the next frame, the panned and zoomed view or the zoomed-out tiles
+        # left over, nothing at either end
+        if target != record or renderer.viewport.moved or renderer.pending:
+            changed = target != record and None     # Only the view moved when False
+            if target != record:
+                cells, record = replay.frame(target), target
+            rects = renderer.draw(surface, cells, changed)
+            rects += renderer.restore(surface, hud_rects(surface))     # Clear the old text
+            render_replay_info(surface, replay, record, REPLAY_SPEEDS[speed])
+            pygame.display.update(rects)
+
+        while state == 'paused':
+            pause_text = pygame.font.SysFont('monospace', 32)\
+                            .render('Paused, press R to resume', True,
+                                    pygame.color.Color(COLORS['pause']))       # Pause message text
+            text_rect = pause_text.get_rect(center=(surface.get_width() // 2, surface.get_height() // 2))
+            surface.blit(pause_text, text_rect)
+            state = handle_pause(renderer.viewport)
+            if state == 'save':
+                # Continue the run from this frame later, with the recording's settings
+                header = replay.header
+                save_game(surface, cells, int(replay.generations[record]), renderer.viewport.cellsize,
+                          header['wrap'], header['rule'], header['seed'], None)
+                state = 'paused'
+            if state == 'running':
+                renderer.restore(surface, [text_rect])  # Clear the pause message
+            if renderer.viewport.moved:
+                # Redraw the panned or zoomed view, the pause message is drawn again next
+                renderer.draw(surface, cells, False)
+                while renderer.pending:
+                    renderer.draw(surface, cells, False)    # Reduce the zoomed-out tiles left over
+                render_replay_info(surface, replay, record, REPLAY_SPEEDS[speed])
+                pygame.display.update()
+            else:
+                pygame.display.update(text_rect)
+
+        if state in ('quit', 'restart'):
+            replay.close()
+        if state == 'quit':
+            quit_game()
+        if state == 'restart':
+            reset_GAME_VARS()
+            main()
+
+def board_engine(rule):
+    """Return the fastest engine running rule, bitpacked for Conway's and buffered otherwise."""
+    return 'bitpacked' if is_conway(rule) else 'buffered'
+
+def game_loop(dimx, dimy, cellsize, wrap, glider_count=None, pattern=None, rule='Conway', seed=None,
+              resume=None):
+    """Main game loop, optionally resuming a (cells, generation) checkpoint.
+
+    The board is stepped by a SimulationThread at clock_speed generations per
+    second while this loop redraws the latest generation at DISPLAY_FPS.
+    """
 
     # Create game surface, window title
-    surface = pygame.display.set_mode((dimx * cellsize, dimy * cellsize))
+    surface = pygame.display.set_mode(WINDOW_SIZE)
     pygame.display.set_caption("Py Game of Life")
+    renderer = make_renderer(dimx, dimy, cellsize)
 
-    # Initialize game state
-    cells = init_game_state(dimx, dimy, pattern, glider_count)
+    # Initialize game state, a resumed board stays memory-mapped
+    if resume is None:
+        cells, gen = init_game_state(dimx, dimy, pattern, glider_count), 0
+    else:
+        cells, gen = resume
     
     clock = pygame.time.Clock()
-    changed_indices = []
-    gen = 0
+    life = None     # HashLife, built on the first jump and kept so memoized nodes are reused
+    clock_speed = 10    # Generations per second
+    simulation = SimulationThread(cells, gen, wrap, rule, clock_speed, STOP_ON_CYCLE,
+                                  board_engine(rule)).start()
+    cycle = simulation.cycle
+    recording = False   # Replay recording, toggled with V
+    jump_note = None    # Shown in place of the J instructions after a jump stopped short or failed
+    hud_stale = False   # Redraw the next frame even if no generation was published
+    timer = PhaseTimer(PERF_PHASES)     # Performance overlay, toggled with H
     running = True      # Pause flag
     state = 'running'   # State flag
-    clock_speed = 10
+
+    def open_recorder(cells, gen):
+        return start_recording(cells, gen, wrap, rule, seed)
 
     while running:
-        running, state, clock_speed = handle_events(clock_speed)
+        running, state, speed = handle_events(clock_speed, renderer.viewport)
+        if speed != clock_speed:
+            clock_speed = speed
+            simulation.set_rate(clock_speed)    # Only the simulation rate, frames stay at DISPLAY_FPS
+
+        if state == 'save':
+            cells, gen, cycle = simulation.snapshot()
+            save_game(surface, cells, gen, renderer.viewport.cellsize, wrap, rule, seed, glider_count)
+            state = 'running'
+
+        if state == 'overlay':
+            if not timer.toggle():
+                # Clear the hidden overlay, later frames only restore the HUD rows
+                pygame.display.update(renderer.restore(surface, hud_rects(surface, True)))
+            state = 'running'
+
+        if state == 'lod':
+            # Switch the zoomed-out blocks between density shades and any-alive
+            renderer.set_lod_mode(LOD_MODES[1 - LOD_MODES.index(renderer.lod_mode)])
+            state = 'running'
+
+        if state == 'record':
+            if not recording:
+                simulation.start_recording(open_recorder)
+            else:
+                simulation.stop_recording().close()
+            recording = not recording
+            state = 'running'
+
         if state == 'running':
+            # Draw the latest generation, skipping the generations finished since the last frame
+            timer.start()
+            # Redraw a moved view or one with zoomed-out tiles left to reduce regardless
+            frame = simulation.frame(renderer.viewport.moved or hud_stale or renderer.pending)
+            timer.lap('frame')
+            if frame is not None:
+                hud_stale = False
+                cells, gen, cycle, changed = frame
+                rects = renderer.draw(surface, cells, changed)          # Draw the regions that changed in view
+                rects += renderer.restore(surface, hud_rects(surface, timer.enabled))  # Clear the old text
+                timer.lap('draw')
+                render_game_info(surface, gen, clock_speed, rule, cycle, recording,
+                                 renderer.viewport.describe(), jump_note)   # Render game information
+                if timer.enabled:
+                    render_perf_overlay(surface, timer, clock, simulation, clock_speed, renderer)
+                timer.lap('text')
             
-            cells, changed_indices = update_game_state(cells, cellsize, wrap)   # Update cells and get changed indices
-            draw_cells(surface, cells, cellsize, changed_indices)               # Draw cells on surface
-            render_game_info(surface, gen, clock_speed)                          # Render game information
-            
-            clock.tick(clock_speed)
-            pygame.display.update()                                 # Update display
-            gen += 1                                                # Increment generation counter
-
-
+            clock.tick(DISPLAY_FPS)
+            timer.lap('tick')
+            if frame is not None:
+                pygame.display.update(rects)                            # Update the changed regions
+            timer.lap('display')
+            timer.end()
+
+        if state == 'jump':
+            # Fast-forward with HashLife while the pattern cannot reach the board edge
+            try:
+                if life is None:
+                    life = HashLife(rule=rule)
+            except ValueError:
+                # B0 rules turn empty space alive, HashLife cannot run them
+                jump_note = 'Jump Unavailable for This Rule'
+            else:
+                simulation.pause()
+                cells, gen, cycle = simulation.snapshot()
+                jumped, generations = jump_ahead(cells, JUMP_EXPONENT, life)
+                if generations:
+                    simulation.replace(jumped, gen + generations)
+                if generations < 2 ** JUMP_EXPONENT:
+                    jump_note = f'Jumped {generations} Generations, Pattern Reached the Edge'
+                else:
+                    jump_note = None
+                simulation.resume()
+            hud_stale = True    # Show the note even if no generation follows
+
+        if state == 'paused':
+            simulation.pause()
+            cells, gen, cycle = simulation.snapshot()
         while state == 'paused':
             # surface.fill(COLORS['background'])  # Clear the screen
             
@@ -224,8 +494,37 @@ def game_loop(dimx, dimy, cellsize, wrap, glider_count=None, pattern=None):
                                     pygame.color.Color(COLORS['pause']))       # Pause message text
             text_rect = pause_text.get_rect(center=(surface.get_width() // 2, surface.get_height() // 2))
             surface.blit(pause_text, text_rect)
-            state = handle_pause()
-            pygame.display.flip()
+            state = handle_pause(renderer.viewport)
+            if state == 'save':
+                save_game(surface, cells, gen, renderer.viewport.cellsize, wrap, rule, seed, glider_count)
+                state = 'paused'
+            if state == 'running':
+                renderer.restore(surface, [text_rect])  # Clear the pause message
+            if renderer.viewport.moved:
+                # Redraw the panned or zoomed view, the pause message is drawn again next
+                cells, gen, cycle, changed = simulation.frame(True)
+                renderer.draw(surface, cells, changed)
+                while renderer.pending:
+                    renderer.draw(surface, cells, False)    # Reduce the zoomed-out tiles left over
+                render_game_info(surface, gen, clock_speed, rule, cycle, recording, renderer.viewport.describe(),
+                                 jump_note)
+                pygame.display.update()
+            else:
+                pygame.display.update(text_rect)
+        if state == 'running':
+            simulation.resume()
+
+        if state in ('quit', 'restart'):
+            simulation.stop()
+            cells, gen, cycle = simulation.snapshot()
+            if recording:
+                simulation.stop_recording().close()
+
+        if state == 'quit':
+            # Keep the board, it can be resumed from the start menu
+            save_checkpoint(CHECKPOINT_PATH, cells, gen, wrap, rule, seed,
+                            c_size=renderer.viewport.cellsize, glider_count=glider_count)
+            quit_game()
         
         if state == 'restart':
             reset_GAME_VARS()
@@ -250,9 +549,43 @@ def start_menu(screen):
         if pygame.mouse.get_pressed()[0]:
             GAME_VARS['start'] = True
             return 
+
+    # Resume button, only shown when a checkpoint was saved
+    if checkpoint_exists(CHECKPOINT_PATH):
+        resume_button = pygame.Rect(300, 400, 200, 50)
+        pygame.draw.rect(screen, COLORS['alive'], resume_button)
+        resume_text = FONT.render("RESUME GAME", True, COLORS['text'])
+        screen.blit(resume_text, (350, 415))
+
+        if resume_button.collidepoint(mouse_pos):
+            if pygame.mouse.get_pressed()[0]:
+                GAME_VARS['start'] = True
+                resume_game()
+
+    # Replay button, only shown when a recording was saved
+    recording = latest_recording(RECORD_DIR)
+    if recording is not None:
+        replay_button = pygame.Rect(300, 500, 200, 50)
+        pygame.draw.rect(screen, COLORS['alive'], replay_button)
+        replay_text = FONT.render("WATCH REPLAY", True, COLORS['text'])
+        screen.blit(replay_text, (345, 515))
+
+        if replay_button.collidepoint(mouse_pos):
+            if pygame.mouse.get_pressed()[0]:
+                GAME_VARS['start'] = True
+                replay_loop(recording)
     pygame.display.flip()
     return
 
+def resume_game():
+    """Continue the game saved in the checkpoint."""
+    cells, meta = load_checkpoint(CHECKPOINT_PATH)
+    dimy, dimx = cells.shape
+    GAME_VARS['wrap'] = meta['wrap']
+    GAME_VARS['rule'] = meta['rule']
+    game_loop(dimx, dimy, meta.get('c_size', 1), meta['wrap'], meta.get('glider_count'),
+              rule=meta['rule'], seed=meta['seed'], resume=(cells, meta['generation']))
+
 def wrap_menu(screen):
     """Display screen to select wrap options."""
 
@@ -285,6 +618,31 @@ def wrap_menu(screen):
     pygame.display.flip()
     return 
 
+def rule_menu(screen):
+    """Display screen to select the life-like rule."""
+
+    # Display rule menu elements
+    screen.fill(COLORS['background'])
+    title_text = FONT.render("Select Rule:", True, COLORS['text'])
+    screen.blit(title_text, (300, 100))
+
+    # One button per named rule, stacked down the screen
+    mouse_pos = pygame.mouse.get_pos()
+    for i, (name, rulestring) in enumerate(RULES.items()):
+        rule_button = pygame.Rect(250, 150 + i * 100, 300, 50)
+        pygame.draw.rect(screen, COLORS['alive'], rule_button)
+        rule_text = FONT.render(f"{name} ({rulestring})", True, COLORS['text'])
+        screen.blit(rule_text, (270, 165 + i * 100))
+
+        # Check if the rule button is clicked
+        if rule_button.collidepoint(mouse_pos):
+            if pygame.mouse.get_pressed()[0]:
+                GAME_VARS['rule'] = name
+                return
+
+    pygame.display.flip()
+    return
+
 def ask_glider(screen):
     """Display screen to select glider options."""
 
@@ -332,12 +690,12 @@ def ask_glider(screen):
         if one_button.collidepoint(mouse_pos):
             if pygame.mouse.get_pressed()[0]:
                 GAME_VARS['glider_count'] = 1
-                game_loop(120, 90, 8, GAME_VARS['wrap'], GAME_VARS['glider_count'])
+                game_loop(120, 90, 8, GAME_VARS['wrap'], GAME_VARS['glider_count'], rule=GAME_VARS['rule'])
                 
         elif two_button.collidepoint(mouse_pos):
             if pygame.mouse.get_pressed()[0]:
                 GAME_VARS['glider_count'] = 2
-                game_loop(120, 90, 8, GAME_VARS['wrap'], GAME_VARS['glider_count'])
+                game_loop(120, 90, 8, GAME_VARS['wrap'], GAME_VARS['glider_count'], rule=GAME_VARS['rule'])
         
     pygame.display.flip()
     return 
@@ -365,6 +723,17 @@ def ask_gameSize(screen):
     text_500 = FONT.render("500", True, COLORS['text'])
     screen.blit(text_500, (630, 115))
 
+    # Larger worlds than the window, viewed through the zoomable viewport
+    button_2000 = pygame.Rect(50, 170, 200, 50)
+    pygame.draw.rect(screen, COLORS['alive'], button_2000)
+    text_2000 = FONT.render("2000", True, COLORS['text'])
+    screen.blit(text_2000, (125, 185))
+
+    button_5000 = pygame.Rect(300, 170, 200, 50)
+    pygame.draw.rect(screen, COLORS['alive'], button_5000)
+    text_5000 = FONT.render("5000", True, COLORS['text'])
+    screen.blit(text_5000, (375, 185))
+
     # Check if size buttons are clicked
     mouse_pos = pygame.mouse.get_pos()
     if button_100.collidepoint(mouse_pos):
@@ -379,6 +748,14 @@ def ask_gameSize(screen):
         if pygame.mouse.get_pressed()[0]:
             GAME_VARS['s_size'] = 500
             return
+    elif button_2000.collidepoint(mouse_pos):
+        if pygame.mouse.get_pressed()[0]:
+            GAME_VARS['s_size'] = 2000
+            return
+    elif button_5000.collidepoint(mouse_pos):
+        if pygame.mouse.get_pressed()[0]:
+            GAME_VARS['s_size'] = 5000
+            return
     
     # If size buttton clicked
     if GAME_VARS['s_size'] is not None:
@@ -464,6 +841,11 @@ def game_logic(screen):
         wrap_menu(screen)
         return  
 
+    # Rule Menu
+    elif GAME_VARS['rule'] is None:
+        rule_menu(screen)
+        return
+
     # Glider Menu
     elif GAME_VARS['glider'] is None or GAME_VARS['glider_count'] is None:
         ask_glider(screen)
@@ -479,9 +861,26 @@ def game_logic(screen):
     # Else run game, with selected parameters 
     else: 
         n, m = GAME_VARS['s_size'], GAME_VARS['s_size']
-        probability = GAME_VARS['c_prob']
-        pattern = np.random.choice([0, 1], size=(n, m), p=[1 - probability, probability])
-        game_loop(n, m, GAME_VARS['c_size'], GAME_VARS['wrap'], glider_count=None, pattern=pattern)
+        try:
+            warning = check_memory_budget(n, m, board_engine(GAME_VARS['rule']), GAME_VARS['c_prob'])
+        except MemoryError as err:
+            # World would not fit, explain and go back to the size menu
+            screen.fill(COLORS['background'])
+            screen.blit(FONT.render(str(err), True, COLORS['text']), (10, 280))
+            pygame.display.flip()
+            pygame.time.wait(3000)
+            GAME_VARS['s_size'] = GAME_VARS['c_size'] = GAME_VARS['c_prob'] = None
+            return
+        if warning is not None:
+            # World fits but only just, say so before starting
+            screen.fill(COLORS['background'])
+            screen.blit(FONT.render(warning, True, COLORS['text']), (10, 280))
+            pygame.display.flip()
+            pygame.time.wait(2000)
+        seed = new_seed()   # Recorded in checkpoints
+        pattern = random_pattern(n, m, GAME_VARS['c_prob'], seed)
+        game_loop(n, m, GAME_VARS['c_size'], GAME_VARS['wrap'], glider_count=None, pattern=pattern,
+                  rule=GAME_VARS['rule'], seed=seed)
 
 def main():
     """Setup, Run Logic"""